@@ -0,0 +1,102 @@
+"""Benchmark of ECTS-weighted averages over a faculty's grades, as lists of grades and as a grade frame. Run with `python -m benchmarks.grade_frame`.
+
+Requires NumPy, install it with the ``numpy`` extra.
+"""
+
+import math
+import random
+import time
+
+from usos_api import GradeFrame
+from usos_api.models import CourseEdition, Grade
+
+VALUES = ("2,0", "3,0", "3,5", "4,0", "4,5", "5,0", "5,5")
+
+
+def make_student_grades(rng: random.Random, terms: int, courses: int) -> list[Grade]:
+    grades = []
+    for term in range(terms):
+        for course in range(courses):
+            value_symbol = rng.choice(VALUES)
+            grades.append(
+                Grade(
+                    value_symbol=value_symbol,
+                    passes=value_symbol != "2,0",
+                    counts_into_average=course % 10 != 0,
+                    weight=float(rng.choice((2, 3, 4, 5, 6))),
+                    course_edition=CourseEdition(
+                        course_id=f"W04-INA-{course:04d}",
+                        term_id=f"20{20 + term}/{21 + term}-Z",
+                    ),
+                )
+            )
+    return grades
+
+
+def python_gpa_by_term(grades: list[Grade]) -> dict[str, float]:
+    sums, totals = {}, {}
+    for grade in grades:
+        if not grade.counts_into_average or grade.value is None or grade.weight is None:
+            continue
+        term_id = grade.course_edition.term_id
+        sums[term_id] = sums.get(term_id, 0.0) + grade.value * grade.weight
+        totals[term_id] = totals.get(term_id, 0.0) + grade.weight
+    return {
+        term_id: sums[term_id] / totals[term_id] for term_id in sums if totals[term_id]
+    }
+
+
+def python_mean(grades: list[Grade]) -> float:
+    counted = [
+        grade
+        for grade in grades
+        if grade.counts_into_average
+        and grade.value is not None
+        and grade.weight is not None
+    ]
+    total = sum(grade.weight for grade in counted)
+    return sum(grade.value * grade.weight for grade in counted) / total
+
+
+def python_pass_rate(grades: list[Grade]) -> float:
+    return sum(1 for grade in grades if grade.passes) / len(grades)
+
+
+def python_report(grades: list[Grade]) -> tuple:
+    return python_mean(grades), python_gpa_by_term(grades), python_pass_rate(grades)
+
+
+def frame_report(frame: GradeFrame) -> tuple:
+    return frame.mean(), frame.gpa_by_term(), frame.pass_rate()
+
+
+def measure(function, argument, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    rng = random.Random(0)
+    students = [make_student_grades(rng, terms=7, courses=8) for _ in range(5000)]
+    grades = [grade for student in students for grade in student]
+
+    start = time.perf_counter()
+    frame = GradeFrame.concat([GradeFrame.from_grades(student) for student in students])
+    conversion = time.perf_counter() - start
+
+    expected, actual = python_report(grades), frame_report(frame)
+    assert math.isclose(expected[0], actual[0])
+    assert all(math.isclose(expected[1][term], actual[1][term]) for term in expected[1])
+    assert math.isclose(expected[2], actual[2])
+
+    python_seconds = measure(python_report, grades)
+    frame_seconds = measure(frame_report, frame)
+    print(f"{len(students)} students, {len(grades)} grades")
+    print(f"  conversion: {conversion * 1e3:8.1f} ms (once)")
+    print(f"  lists     : {python_seconds * 1e3:8.1f} ms per report")
+    print(f"  frame     : {frame_seconds * 1e3:8.1f} ms per report")
+    print(f"Speedup: {python_seconds / frame_seconds:.0f}x")
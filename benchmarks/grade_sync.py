@@ -0,0 +1,67 @@
+"""Benchmark of polling students' grades with full decoding and with an incremental sync. Run with `python -m benchmarks.grade_sync`.
+
+Measures the CPU time spent on responses only, without the requests themselves.
+"""
+
+import time
+
+from pydantic import TypeAdapter
+
+from benchmarks.model_building import make_grades_payload
+from usos_api import GradeSync, json_backend
+from usos_api.services.grades import _TermsGrades
+
+STUDENTS = 500
+TERM_IDS = [f"20{20 + term}/{21 + term}-Z" for term in range(7)]
+
+
+def make_body(changed: bool) -> bytes:
+    payload = make_grades_payload(terms=7, courses=8)
+    if changed:
+        grade = payload[TERM_IDS[-1]]["W04-INA-0000"]["course_grades"][0]["1"]
+        grade["value_symbol"] = "5,0"
+        grade["date_modified"] = "2024-06-30 08:00:00"
+    return json_backend.dumps(payload)
+
+
+def poll_full(adapter: TypeAdapter, bodies: list[bytes]) -> None:
+    for body in bodies:
+        adapter.validate_json(body)
+
+
+def poll_sync(sync: GradeSync, bodies: list[bytes]) -> int:
+    return sum(
+        len(sync.apply_responses(student, [(TERM_IDS, body)]))
+        for student, body in enumerate(bodies)
+    )
+
+
+if __name__ == "__main__":
+    adapter = TypeAdapter(_TermsGrades)
+    unchanged = [make_body(False) for _ in range(STUDENTS)]
+    changed = [make_body(student % 10 == 0) for student in range(STUDENTS)]
+
+    sync = GradeSync(None)
+    poll_sync(sync, unchanged)  # Initial snapshot
+
+    start = time.perf_counter()
+    poll_full(adapter, unchanged)
+    full = time.perf_counter() - start
+
+    start = time.perf_counter()
+    poll_sync(sync, unchanged)
+    sync_unchanged = time.perf_counter() - start
+
+    start = time.perf_counter()
+    events = poll_sync(sync, changed)
+    sync_changed = time.perf_counter() - start
+    assert events == STUDENTS // 10
+
+    print(f"{STUDENTS} students, {len(unchanged[0]) / 1e3:.0f} kB of grades each")
+    print(f"  full decoding        : {full * 1e6 / STUDENTS:8.1f} us per student")
+    print(
+        f"  sync, nothing changed: {sync_unchanged * 1e6 / STUDENTS:8.1f} us per student"
+    )
+    print(
+        f"  sync, 10% changed    : {sync_changed * 1e6 / STUDENTS:8.1f} us per student, {events} events"
+    )
@@ -0,0 +1,100 @@
+"""Memory report of interning groups loaded for a whole cohort. Run with `python -m benchmarks.interning`."""
+
+import random
+import time
+import tracemalloc
+
+from usos_api import InternPool, json_backend
+from usos_api.endpoint import get_type_adapter
+from usos_api.services.groups import _TermGroups
+
+CLASS_TYPES = {
+    "WYK": {"pl": "Wykład", "en": "Lecture"},
+    "CW": {"pl": "Ćwiczenia", "en": "Classes"},
+    "LAB": {"pl": "Laboratorium", "en": "Laboratory"},
+    "PRO": {"pl": "Projekt", "en": "Project"},
+}
+
+
+def make_catalog(courses: int) -> list[dict]:
+    catalog = []
+    for course in range(courses):
+        for number, class_type_id in enumerate(CLASS_TYPES, start=1):
+            catalog.append(
+                {
+                    "course_unit_id": str(100000 + course * 10 + number),
+                    "group_number": number,
+                    "class_type": CLASS_TYPES[class_type_id],
+                    "class_type_id": class_type_id,
+                    "group_url": f"https://usos.pwr.edu.pl/groups/{course}/{number}",
+                    "course_id": f"W04-INA-{course:04d}",
+                    "course_name": {
+                        "pl": f"Przedmiot numer {course}",
+                        "en": f"Course number {course}",
+                    },
+                    "course_fac_id": "W04N",
+                    "course_lang_id": "pl",
+                    "term_id": "2023/24-Z",
+                }
+            )
+    return catalog
+
+
+def make_responses(students: int, groups_per_student: int) -> list[bytes]:
+    catalog = make_catalog(courses=100)
+    rng = random.Random(0)
+    return [
+        json_backend.dumps(
+            {
+                "groups": {"2023/24-Z": rng.sample(catalog, groups_per_student)},
+                "terms": [{"id": "2023/24-Z", "name": {"pl": "Zima", "en": "Winter"}}],
+            }
+        )
+        for _ in range(students)
+    ]
+
+
+def load_cohort(responses: list[bytes], pool: InternPool | None) -> list:
+    adapter = get_type_adapter(_TermGroups)
+    cohort = []
+    for body in responses:
+        response = adapter.validate_json(body)
+        cohort.append(pool.intern(response) if pool is not None else response)
+    return cohort
+
+
+def measure_time(responses: list[bytes], pool_factory, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        pool = pool_factory()
+        start = time.perf_counter()
+        load_cohort(responses, pool)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_size(responses: list[bytes], pool: InternPool | None) -> int:
+    # Timed separately, tracing allocations slows down Python code much more than pydantic-core
+    tracemalloc.start()
+    cohort = load_cohort(responses, pool)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cohort
+    return size
+
+
+if __name__ == "__main__":
+    responses = make_responses(students=10_000, groups_per_student=8)
+    plain_time = measure_time(responses, lambda: None)
+    pool_time = measure_time(responses, InternPool)
+    plain_size = measure_size(responses, None)
+    pool = InternPool()
+    pool_size = measure_size(responses, pool)
+    print("10000 students x 8 groups")
+    print(f"{'plain':>10}: {plain_size / 1e6:8.1f} MB retained, {plain_time:6.2f} s")
+    print(f"{'interned':>10}: {pool_size / 1e6:8.1f} MB retained, {pool_time:6.2f} s")
+    print(
+        f"Saved: {(plain_size - pool_size) / 1e6:.1f} MB ({1 - pool_size / plain_size:.0%}),"
+        f" loading time x{pool_time / plain_time:.2f}"
+    )
+    print(pool.get_stats())
@@ -0,0 +1,98 @@
+"""Benchmark of listing a student's course editions with full and lazy models. Run with `python -m benchmarks.lazy_models`."""
+
+import time
+import tracemalloc
+
+from usos_api import json_backend
+from usos_api.models import CourseEdition, LazyModel
+
+
+def make_person(person_id: int) -> dict:
+    return {
+        "id": str(person_id),
+        "first_name": "Anna",
+        "last_name": f"Nowak{person_id}",
+    }
+
+
+def make_course_edition(term: int, course: int) -> dict:
+    return {
+        "course_id": f"W04-INA-{course:04d}",
+        "course_name": {"pl": f"Przedmiot {course}", "en": f"Course {course}"},
+        "term_id": f"20{20 + term}/{21 + term}-Z",
+        "homepage_url": None,
+        "profile_url": f"https://usos.pwr.edu.pl/course/{course}",
+        "coordinators": [make_person(course), make_person(course + 1)],
+        "lecturers": [make_person(course + person) for person in range(3)],
+        "passing_status": "passed",
+        "user_groups": [
+            {
+                "course_unit_id": str(100000 + course * 10 + unit),
+                "group_number": 1,
+                "class_type": {"pl": "Wykład", "en": "Lecture"},
+                "course_name": {"pl": f"Przedmiot {course}", "en": f"Course {course}"},
+                "term_id": f"20{20 + term}/{21 + term}-Z",
+                "lecturers": [make_person(course)],
+            }
+            for unit in range(3)
+        ],
+        "grades": [
+            {"value_symbol": "4,5", "exam_id": course, "exam_session_number": 1}
+        ],
+        "attributes": [{"name": [{"pl": "Obowiązkowy", "en": "Mandatory"}]}],
+    }
+
+
+def make_response(terms: int, courses: int) -> bytes:
+    return json_backend.dumps(
+        {
+            "course_editions": {
+                f"20{20 + term}/{21 + term}-Z": [
+                    make_course_edition(term, term * courses + course)
+                    for course in range(courses)
+                ]
+                for term in range(terms)
+            }
+        }
+    )
+
+
+def list_courses(body: bytes, lazy: bool) -> tuple[list[tuple], list]:
+    response = json_backend.loads(body)
+    course_editions = [
+        (
+            LazyModel(CourseEdition, course_edition)
+            if lazy
+            else CourseEdition(**course_edition)
+        )
+        for course_editions in response["course_editions"].values()
+        for course_edition in course_editions
+    ]
+    return [
+        (course_edition.course_id, course_edition.course_name.en)
+        for course_edition in course_editions
+    ], course_editions
+
+
+def measure(body: bytes, lazy: bool, repeat: int = 20) -> tuple[float, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list_courses(body, lazy)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    result = list_courses(body, lazy)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, size
+
+
+if __name__ == "__main__":
+    body = make_response(terms=10, courses=8)
+    assert list_courses(body, True)[0] == list_courses(body, False)[0]
+    results = {"full": measure(body, False), "lazy": measure(body, True)}
+    print(f"80 course editions, {len(body) / 1e3:.0f} kB, reading two fields")
+    for name, (seconds, size) in results.items():
+        print(f"{name:>8}: {seconds * 1e3:8.2f} ms, {size / 1e3:8.0f} kB retained")
+    print(f"Speedup: {results['full'][0] / results['lazy'][0]:.1f}x")
@@ -0,0 +1,151 @@
+"""Benchmark of building models from large grade and participant responses. Run with `python -m benchmarks.model_building`.
+
+Compares validating decoded dictionaries (the ``Model(**data)`` path) with validating raw bytes (what endpoints do).
+Also compares ``User`` with its mutable defaults (``= []`` / ``= {}``, as before) and with default factories, both
+when validated and when built with trusted, unvalidated construction (``model_construct``).
+"""
+
+import time
+
+from pydantic import BaseModel, TypeAdapter, create_model
+
+from usos_api import json_backend
+from usos_api.models import Group, User
+from usos_api.services.grades import _TermsGrades
+
+
+def make_user(user_id: int) -> dict:
+    return {
+        "id": str(user_id),
+        "first_name": "Jan",
+        "last_name": f"Kowalski{user_id}",
+        "sex": "M" if user_id % 2 else "F",
+        "student_status": 2,
+        "staff_status": 0,
+        "email": f"{user_id}@student.pwr.edu.pl",
+        "student_number": str(200000 + user_id),
+        "birth_date": "2001-05-17",
+        "photo_urls": {"50x50": f"https://photos.usos.pwr.edu.pl/{user_id}.jpg"},
+    }
+
+
+def make_grade(number: int) -> dict:
+    return {
+        "value_symbol": ("3,0", "3,5", "4,0", "4,5", "5,0", "2,0")[number % 6],
+        "passes": number % 6 != 5,
+        "value_description": {"pl": "dobry", "en": "good"},
+        "exam_id": 100000 + number,
+        "exam_session_number": 1,
+        "counts_into_average": True,
+        "date_modified": "2024-02-01 12:34:56",
+    }
+
+
+def make_grades_payload(terms: int, courses: int) -> dict:
+    return {
+        f"20{20 + term}/{21 + term}-Z": {
+            f"W04-INA-{course:04d}": {
+                "course_units_grades": {
+                    f"{course}{unit}": [{"1": make_grade(course + unit), "2": None}]
+                    for unit in range(3)
+                },
+                "course_grades": [{"1": make_grade(course)}],
+            }
+            for course in range(courses)
+        }
+        for term in range(terms)
+    }
+
+
+def make_groups_payload(groups: int, participants: int) -> list:
+    return [
+        {
+            "course_unit_id": str(100000 + group),
+            "group_number": group % 20 + 1,
+            "class_type": {"pl": "Laboratorium", "en": "Laboratory"},
+            "course_id": "W04-INA-0001",
+            "course_name": {"pl": "Bazy danych", "en": "Databases"},
+            "term_id": "2023/24-Z",
+            "lecturers": [make_user(group)],
+            "participants": [
+                make_user(group * participants + user) for user in range(participants)
+            ],
+        }
+        for group in range(groups)
+    ]
+
+
+def with_mutable_defaults(model: type[BaseModel]) -> type[BaseModel]:
+    """The model as it was before default factories: list and dict fields default to shared ``[]`` / ``{}``."""
+    fields = {
+        name: (field.annotation, field.default_factory())
+        for name, field in model.model_fields.items()
+        if field.default_factory in (list, dict)
+    }
+    return create_model(
+        f"{model.__name__}WithMutableDefaults", __base__=model, **fields
+    )
+
+
+def count_models(value) -> int:
+    if isinstance(value, BaseModel):
+        return 1 + sum(count_models(item) for item in value.__dict__.values())
+    if isinstance(value, dict):
+        return sum(count_models(item) for item in value.values())
+    if isinstance(value, list):
+        return sum(count_models(item) for item in value)
+    return 0
+
+
+def measure(function, body: bytes, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(body)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    payloads = {
+        "grades (10 terms x 200 courses)": (_TermsGrades, make_grades_payload(10, 200)),
+        "participants (200 groups x 50 users)": (
+            list[Group],
+            make_groups_payload(200, 50),
+        ),
+    }
+    print(f"JSON backend: {json_backend.get_json_backend().name}")
+    for name, (response_type, payload) in payloads.items():
+        body = json_backend.dumps(payload)
+        adapter = TypeAdapter(response_type)
+        objects = count_models(adapter.validate_json(body))
+
+        results = {
+            "validate dicts": measure(
+                lambda data: adapter.validate_python(json_backend.loads(data)), body
+            ),
+            "validate bytes": measure(adapter.validate_json, body),
+        }
+        print(f"{name}: {objects} objects, {len(body) / 1e6:.1f} MB")
+        for path, seconds in results.items():
+            print(f"{path:>16}: {objects / seconds:12,.0f} objects/s")
+
+    users = [make_user(user) for user in range(5000)]
+    body = json_backend.dumps(users)
+    defaults = sum(
+        field.default_factory in (list, dict) for field in User.model_fields.values()
+    )
+    print(f"users ({len(users)}, {defaults} list/dict fields left at their defaults):")
+    models = {"mutable defaults": with_mutable_defaults(User), "default factory": User}
+    results = {}
+    for label, model in models.items():
+        results[label] = measure(TypeAdapter(list[model]).validate_json, body)
+    for label, model in models.items():
+        results[f"trusted, {label}"] = measure(
+            lambda data, model=model: [
+                model.model_construct(**user) for user in json_backend.loads(data)
+            ],
+            body,
+        )
+    for path, seconds in results.items():
+        print(f"{path:>25}: {seconds / len(users) * 1e6:8.2f} µs/user")
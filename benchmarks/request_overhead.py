@@ -0,0 +1,133 @@
+"""Microbenchmark of the per-call CPU cost of preparing a request, before the request-preparation changes (oauthlib signing, parameters encoded twice) and with endpoint descriptors. Run with `python -m benchmarks.request_overhead`."""
+
+import asyncio
+import time
+import timeit
+from urllib.parse import urlencode, urlparse
+
+import aiohttp
+from aiohttp import web
+from oauthlib.oauth1 import Client
+from yarl import URL
+
+from usos_api.connection import USOSAPIConnection
+
+BASE_ADDRESS = "https://apps.usos.pwr.edu.pl/"
+SERVICE = "services/terms/terms"
+FIELDS = "id|name|start_date|end_date|finish_date|order_key|is_active"
+TERM_IDS = "2022/23-Z|2022/23-L|2023/24-Z"
+
+
+def baseline_prepare(
+    client: Client, http_method: str, base_address: str = BASE_ADDRESS
+):
+    """The request preparation done by ``USOSAPIConnection`` before endpoint descriptors, signing with ``oauthlib``."""
+    kwargs = {"term_ids": TERM_IDS, "fields": FIELDS, "lang": None}
+    kwargs = {k: str(v) for k, v in kwargs.items() if v is not None}
+    if http_method == "GET":
+        url_parts = [f"{base_address}{SERVICE}"]
+        query_string = urlparse(url_parts[0]).query
+        url_parts.append("&" if query_string else "?")
+        url_parts.append(urlencode(kwargs))
+        url, headers, body = client.sign("".join(url_parts), headers={})
+        # aiohttp encodes the parameters again, into the query string
+        return URL(url).extend_query(kwargs), headers, None
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    url, headers, body = client.sign(
+        f"{base_address}{SERVICE}", http_method="POST", body=kwargs, headers=headers
+    )
+    # aiohttp encodes the form body again
+    return URL(url), headers, aiohttp.FormData(body)()
+
+
+def make_client() -> Client:
+    """The ``oauthlib`` client ``AuthManager`` signed requests with before the fast signer."""
+    return Client(
+        "consumer",
+        client_secret="consumer&secret",
+        resource_owner_key="token",
+        resource_owner_secret="token secret",
+    )
+
+
+def endpoint_prepare(endpoint, http_method: str):
+    """The request preparation done by an endpoint descriptor."""
+    params = endpoint.prepare_params({"term_ids": TERM_IDS})
+    return endpoint.prepare_request(http_method, params)
+
+
+async def measure_round_trips(number: int) -> dict[str, float]:
+    """Measure full round trips to a local server, including aiohttp's own overhead."""
+
+    async def handle(request: web.Request) -> web.Response:
+        await request.read()
+        return web.Response(body=b"{}", content_type="application/json")
+
+    app = web.Application()
+    app.router.add_route("*", "/{tail:.*}", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    base_address = f"http://127.0.0.1:{port}/"
+    connection = USOSAPIConnection(base_address, "consumer", "consumer&secret")
+    connection.auth_manager.load_access_token("token", "token secret")
+    results = {}
+    async with connection:
+        session = connection.pool.session
+        endpoint = connection.endpoint(SERVICE, fields=FIELDS)
+
+        client = make_client()
+
+        async def baseline_send():
+            url, headers, body = baseline_prepare(client, "POST", base_address)
+            async with session.post(url, data=body, headers=headers) as response:
+                return await response.read()
+
+        for name, send in (
+            ("baseline", baseline_send),
+            ("endpoint", endpoint.post_raw),
+        ):
+            for _ in range(100):
+                await send()
+            start = time.perf_counter()
+            for _ in range(number):
+                await send()
+            results[name] = time.perf_counter() - start
+    await runner.cleanup()
+    return results
+
+
+def report(title: str, results: dict[str, float], number: int) -> None:
+    print(title)
+    for name, seconds in results.items():
+        print(f"{name:>16}: {seconds / number * 1e6:8.2f} µs/request")
+    print(f"Speedup: {results['baseline'] / results['endpoint']:.1f}x")
+
+
+if __name__ == "__main__":
+    connection = USOSAPIConnection(BASE_ADDRESS, "consumer", "consumer&secret")
+    connection.auth_manager.load_access_token("token", "token secret")
+    endpoint = connection.endpoint(SERVICE, fields=FIELDS)
+
+    client = make_client()
+    number = 20000
+    for http_method in ("GET", "POST"):
+        results = {
+            "baseline": timeit.timeit(
+                lambda: baseline_prepare(client, http_method), number=number
+            ),
+            "endpoint": timeit.timeit(
+                lambda: endpoint_prepare(endpoint, http_method), number=number
+            ),
+        }
+        report(f"Request preparation ({http_method})", results, number)
+
+    number = 2000
+    report(
+        "Round trip to a local server (POST)",
+        asyncio.run(measure_round_trips(number)),
+        number,
+    )
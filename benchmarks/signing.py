@@ -0,0 +1,59 @@
+"""Microbenchmark of the fast OAuth signer compared to oauthlib. Run with `python -m benchmarks.signing`."""
+
+import timeit
+
+from oauthlib.oauth1 import Client
+
+from usos_api.signing import HMACSHA1Signer
+
+URL = "https://apps.usos.pwr.edu.pl/services/grades/terms2"
+PARAMS = {
+    "term_ids": "2022/23-Z|2022/23-L|2023/24-Z",
+    "fields": "value_symbol|passes|value_description|exam_id|exam_session_number",
+    "lang": "pl",
+    "query": "zażółć gęślą jaźń ~!*()'",
+}
+HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+NONCE = "1234567890123456789"
+TIMESTAMP = "1700000000"
+
+
+def oauthlib_sign(client: Client) -> str:
+    return client.sign(URL, http_method="POST", body=PARAMS, headers=HEADERS)[1][
+        "Authorization"
+    ]
+
+
+def fast_sign(signer: HMACSHA1Signer) -> str:
+    return signer.sign("POST", URL, PARAMS.items())
+
+
+if __name__ == "__main__":
+    fixed_client = Client(
+        "consumer",
+        client_secret="consumer&secret",
+        resource_owner_key="token",
+        resource_owner_secret="token secret",
+        nonce=NONCE,
+        timestamp=TIMESTAMP,
+    )
+    signer = HMACSHA1Signer("consumer", "consumer&secret", "token", "token secret")
+    assert oauthlib_sign(fixed_client) == signer.sign(
+        "POST", URL, PARAMS.items(), nonce=NONCE, timestamp=TIMESTAMP
+    ), "Signatures differ"
+    print("Signatures are identical")
+
+    client = Client(
+        "consumer",
+        client_secret="consumer&secret",
+        resource_owner_key="token",
+        resource_owner_secret="token secret",
+    )
+    number = 20000
+    results = {
+        "oauthlib": timeit.timeit(lambda: oauthlib_sign(client), number=number),
+        "HMACSHA1Signer": timeit.timeit(lambda: fast_sign(signer), number=number),
+    }
+    for name, seconds in results.items():
+        print(f"{name:>16}: {seconds / number * 1e6:8.2f} µs/request")
+    print(f"Speedup: {results['oauthlib'] / results['HMACSHA1Signer']:.1f}x")
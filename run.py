@@ -6,6 +6,7 @@ import os
 
 from dotenv import load_dotenv
 
+from usos_api.cache import SQLiteCacheBackend
 from usos_api.client import USOSClient
 from usos_api.exceptions import USOSAPIException
 
@@ -57,29 +58,24 @@ async def fetch_documentation(
         documentation_service = client.api_documentation_service
 
         method_index = await documentation_service.get_method_index()
-        modules = set()
-
-        for method in method_index:
-            module = method.name.split("/")[1]
-            modules.add(module)
-
         modules_info = []
-        for module in modules:
-            print(f"Fetching documentation for module {module}")
-            module_info = await documentation_service.get_module_info(module)
-            module_info = module_info.dict()
-            module_info["methods_info"] = {}
-            for method in module_info["methods"]:
-                print(f"Fetching documentation for method {method}")
-                method_info = await documentation_service.get_method_info(method)
-                module_info["methods_info"][method] = method_info.dict()
-
-            modules_info.append(module_info)
+        store = SQLiteCacheBackend("usos_api_documentation.sqlite3")
+        try:
+            async for module in documentation_service.crawl(store):
+                print(f"Fetched documentation for module {module.name}")
+                module_info = module.info.model_dump()
+                module_info["methods_info"] = {
+                    method: method_info.model_dump()
+                    for method, method_info in module.methods.items()
+                }
+                modules_info.append(module_info)
+        finally:
+            await store.close()
 
     # Combine fetched data
     documentation = {
-        "method_index": [method.dict() for method in method_index],
-        "modules": [module for module in modules_info],
+        "method_index": [method.model_dump() for method in method_index],
+        "modules": modules_info,
     }
 
     return documentation
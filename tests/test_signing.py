@@ -0,0 +1,111 @@
+import re
+from urllib.parse import urlencode
+
+import pytest
+from oauthlib.oauth1 import Client
+
+from usos_api.connection import USOSAPIConnection
+from usos_api.signing import HMACSHA1Signer
+
+BASE_ADDRESS = "https://apps.usos.pwr.edu.pl/"
+URL = f"{BASE_ADDRESS}services/grades/terms2"
+NONCE = "1234567890123456789"
+TIMESTAMP = "1700000000"
+FORM_HEADERS = {"Content-Type": "application/x-www-form-urlencoded"}
+
+PARAMS = {
+    "empty": [],
+    "ascii": [("term_ids", "2022/23-Z|2023/24-Z"), ("fields", "value_symbol")],
+    "repeated": [("id", "1"), ("id", "2"), ("id", "1"), ("a", "x")],
+    "unicode": [("query", "zażółć gęślą jaźń"), ("name", "Łukasz Żółw ~!*()'")],
+    "reserved": [("q", "a b+c&d=e/f?g#h%i"), ("x y", "=&")],
+}
+TOKENS = {
+    "token": ("token", "token secret"),
+    "no token": (None, None),
+}
+
+
+def oauthlib_sign(
+    http_method: str,
+    url: str,
+    params: list[tuple[str, str]],
+    token: str | None,
+    token_secret: str | None,
+) -> str:
+    client = Client(
+        "consumer",
+        client_secret="consumer&secret",
+        resource_owner_key=token,
+        resource_owner_secret=token_secret,
+        nonce=NONCE,
+        timestamp=TIMESTAMP,
+    )
+    if http_method == "GET":
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        return client.sign(url, http_method="GET")[1]["Authorization"]
+    return client.sign(
+        url, http_method="POST", body=urlencode(params), headers=FORM_HEADERS
+    )[1]["Authorization"]
+
+
+@pytest.mark.parametrize("http_method", ["GET", "POST"])
+@pytest.mark.parametrize("params", PARAMS.values(), ids=PARAMS.keys())
+@pytest.mark.parametrize("token", TOKENS.values(), ids=TOKENS.keys())
+def test_signature_matches_oauthlib(http_method, params, token):
+    signer = HMACSHA1Signer("consumer", "consumer&secret", *token)
+
+    signature = signer.sign(http_method, URL, params, nonce=NONCE, timestamp=TIMESTAMP)
+
+    assert signature == oauthlib_sign(http_method, URL, params, *token)
+
+
+@pytest.mark.parametrize("token", TOKENS.values(), ids=TOKENS.keys())
+def test_repeated_signing_is_stable(token):
+    signer = HMACSHA1Signer("consumer", "consumer&secret", *token)
+    params = PARAMS["unicode"]
+
+    signatures = {
+        signer.sign("POST", URL, params, nonce=NONCE, timestamp=TIMESTAMP)
+        for _ in range(3)
+    }
+
+    assert signatures == {oauthlib_sign("POST", URL, params, *token)}
+
+
+def test_generated_nonces_differ():
+    signer = HMACSHA1Signer("consumer", "consumer&secret", "token", "token secret")
+
+    assert signer.sign("GET", URL) != signer.sign("GET", URL)
+
+
+@pytest.mark.parametrize("http_method", ["GET", "POST"])
+def test_sent_request_matches_oauthlib(http_method):
+    token = TOKENS["token"]
+    connection = USOSAPIConnection(BASE_ADDRESS, "consumer", "consumer&secret")
+    connection.auth_manager.load_access_token(*token)
+    endpoint = connection.endpoint(
+        "services/grades/terms2", fields="value_symbol|passes"
+    )
+    params = endpoint.prepare_params({"term_ids": "2023/24-Z", "query": "żółw ~"})
+
+    url, headers, body = endpoint.prepare_request(http_method, params)
+
+    nonce = re.search(r'oauth_nonce="([^"]*)"', headers["Authorization"])[1]
+    timestamp = re.search(r'oauth_timestamp="([^"]*)"', headers["Authorization"])[1]
+    client = Client(
+        "consumer",
+        client_secret="consumer&secret",
+        resource_owner_key=token[0],
+        resource_owner_secret=token[1],
+        nonce=nonce,
+        timestamp=timestamp,
+    )
+    if http_method == "GET":
+        expected = client.sign(str(url), http_method="GET")[1]["Authorization"]
+    else:
+        expected = client.sign(
+            str(url), http_method="POST", body=body.decode(), headers=FORM_HEADERS
+        )[1]["Authorization"]
+    assert headers["Authorization"] == expected
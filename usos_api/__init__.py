@@ -1,5 +1,78 @@
+from .cache import (
+    CacheBackend,
+    CacheRule,
+    CacheStats,
+    MemoryCacheBackend,
+    ResponseCache,
+    SQLiteCacheBackend,
+    TermCachePolicy,
+)
 from .client import USOSClient
-from .exceptions import USOSAPIException
+from .clock import ClockSample, ServerClock
+from .context import UserContext, current_user_context
+from .endpoint import Endpoint
+from .entity_store import EntityStore, EntityStoreStats, EntityType
+from .exceptions import USOSAPIException, USOSAPIHTTPException
+from .grade_frame import GradeFrame
+from .grade_sync import GradeEvent, GradeSync
+from .intern import InternPool, InternStats
+from .json_backend import (
+    JSONBackend,
+    OrjsonBackend,
+    get_json_backend,
+    set_json_backend,
+)
 from .logger import get_logger
+from .pool import ConnectionPool, PoolStats
+from .prepared_registration import PreparedRegistration, RegistrationTiming
+from .rate_limit import RateLimit, RateLimiter, RateLimiterStats
+from .registration_watcher import CartChange, RegistrationWatcher, RoundChange
+from .retry import RetryBudget, RetryPolicy
+from .scheduler import Scheduler, SchedulerStats
+from .services.api_documentation import ModuleDocumentation
 
-__all__ = ["USOSClient", "USOSAPIException", "get_logger"]
+__all__ = [
+    "USOSClient",
+    "USOSAPIException",
+    "get_logger",
+    "ConnectionPool",
+    "PoolStats",
+    "UserContext",
+    "current_user_context",
+    "RateLimit",
+    "RateLimiter",
+    "RateLimiterStats",
+    "RetryBudget",
+    "RetryPolicy",
+    "USOSAPIHTTPException",
+    "CacheBackend",
+    "CacheRule",
+    "CacheStats",
+    "MemoryCacheBackend",
+    "ResponseCache",
+    "SQLiteCacheBackend",
+    "TermCachePolicy",
+    "Endpoint",
+    "JSONBackend",
+    "OrjsonBackend",
+    "get_json_backend",
+    "set_json_backend",
+    "InternPool",
+    "InternStats",
+    "EntityStore",
+    "EntityStoreStats",
+    "EntityType",
+    "GradeFrame",
+    "GradeSync",
+    "GradeEvent",
+    "Scheduler",
+    "SchedulerStats",
+    "ServerClock",
+    "ClockSample",
+    "PreparedRegistration",
+    "RegistrationTiming",
+    "RegistrationWatcher",
+    "CartChange",
+    "RoundChange",
+    "ModuleDocumentation",
+]
@@ -3,8 +3,11 @@ import urllib
 import aiohttp
 from oauthlib.oauth1 import Client
 
+from .context import UserContext, current_user_context
 from .exceptions import USOSAPIException
 from .logger import get_logger
+from .pool import ConnectionPool
+from .signing import HMACSHA1Signer
 
 _LOGGER = get_logger("AuthManager")
 
@@ -27,6 +30,7 @@ class AuthManager:
         consumer_key: str,
         consumer_secret: str,
         trust_env: bool = False,
+        pool: ConnectionPool | None = None,
     ):
         """
         Initialize the authentication manager.
@@ -34,16 +38,18 @@ class AuthManager:
         :param api_base_address: The base address of the USOS API.
         :param consumer_key: Consumer key obtained from the USOS API.
         :param consumer_secret: Consumer secret obtained from the USOS API.
-        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information.
+        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information. Ignored if `pool` is given.
+        :param pool: The connection pool to use, usually shared with :class:`USOSAPIConnection`. If not given, a new pool is created.
         """
         self.base_address = api_base_address.rstrip("/") + "/"
         self.consumer_key = consumer_key
         self.consumer_secret = consumer_secret
         self.access_token = None
         self.access_token_secret = None
-        self._session = None
+        self.pool = pool or ConnectionPool(trust_env=trust_env)
         self.trust_env = trust_env
         self._oauth_client = Client(consumer_key, consumer_secret)
+        self._signer = None
 
     async def __aenter__(self) -> "AuthManager":
         """
@@ -68,14 +74,13 @@ class AuthManager:
         """
         Open the manager.
         """
-        self._session = aiohttp.ClientSession(trust_env=self.trust_env)
+        await self.pool.open()
 
     async def close(self):
         """
         Close the manager.
         """
-        if self._session:
-            await self._session.close()
+        await self.pool.close()
 
     async def _generate_request_token(self, callback_url: str) -> None:
         """
@@ -94,7 +99,7 @@ class AuthManager:
         ).sign(
             url, http_method="POST", body=params, headers=headers
         )  # Use a new client to avoid using the access token if it's set
-        async with self._session.post(url, data=body, headers=headers) as response:
+        async with self.pool.session.post(url, data=body, headers=headers) as response:
             await self._handle_response_errors(response)
             data = dict(urllib.parse.parse_qsl(await response.text()))
             self._request_token = data["oauth_token"]
@@ -134,19 +139,12 @@ class AuthManager:
             self._oauth_client.resource_owner_secret = request_token_secret
         url = f"{self.base_address}{self.ACCESS_TOKEN_SUFFIX}"
         url, headers, body = self._oauth_client.sign(url, http_method="POST")
-        try:
-            async with self._session.post(url, data=body, headers=headers) as response:
-                await self._handle_response_errors(response)
-                data = dict(urllib.parse.parse_qsl(await response.text()))
-                self.load_access_token(data["oauth_token"], data["oauth_token_secret"])
-                _LOGGER.debug("Authorization successful, received access token")
-                return self.access_token, self.access_token_secret
-        except AttributeError as e:
-            if e.args[0] == "'NoneType' object has no attribute 'post'":
-                raise USOSAPIException(
-                    "Authorization failed. Did you forget to open the manager?"
-                )
-            raise
+        async with self.pool.session.post(url, data=body, headers=headers) as response:
+            await self._handle_response_errors(response)
+            data = dict(urllib.parse.parse_qsl(await response.text()))
+            self.load_access_token(data["oauth_token"], data["oauth_token_secret"])
+            _LOGGER.debug("Authorization successful, received access token")
+            return self.access_token, self.access_token_secret
 
     def load_access_token(self, access_token: str, access_token_secret: str):
         """
@@ -163,24 +161,66 @@ class AuthManager:
             resource_owner_key=self.access_token,
             resource_owner_secret=self.access_token_secret,
         )
+        self._signer = HMACSHA1Signer(
+            self.consumer_key,
+            self.consumer_secret,
+            self.access_token,
+            self.access_token_secret,
+        )
 
     def get_access_token(self):
         return self.access_token, self.access_token_secret
 
+    def get_token_identity(self) -> str | None:
+        """
+        Get the access token requests are currently signed with.
+
+        :return: The access token of the active :class:`UserContext`, or the manager's own access token.
+        """
+        user_context = current_user_context()
+        if user_context is not None:
+            return user_context.access_token
+        return self.access_token
+
     def get_request_token(self):
         return self._request_token, self._request_token_secret
 
+    def create_user_context(
+        self, access_token: str, access_token_secret: str
+    ) -> UserContext:
+        """
+        Create a lightweight context for making requests on behalf of another user.
+
+        :param access_token: The access token of the user.
+        :param access_token_secret: The access token secret of the user.
+        :return: The user context.
+        """
+        return UserContext(
+            self.consumer_key, self.consumer_secret, access_token, access_token_secret
+        )
+
     def sign_request(
         self, url: str, http_method: str = "GET", **kwargs
     ) -> tuple[str, dict, dict]:
         """
         Sign a request with the OAuth client.
 
+        If a :class:`UserContext` is active, the request is signed with its token instead of the manager's one.
+
         :param url: The URL to sign.
         :param http_method: The HTTP method to use.
         :param kwargs: Additional parameters to pass.
         :return: The signed URL, headers, and body.
         """
+        user_context = current_user_context()
+        if user_context is not None:
+            client = Client(
+                self.consumer_key,
+                client_secret=self.consumer_secret,
+                resource_owner_key=user_context.access_token,
+                resource_owner_secret=user_context.access_token_secret,
+            )
+            return client.sign(url, http_method=http_method, **kwargs)
         if not self.access_token:
             raise USOSAPIException("Access token not set. Did you forget to authorize?")
         url, headers, body = self._oauth_client.sign(
@@ -188,6 +228,21 @@ class AuthManager:
         )
         return url, headers, body
 
+    def get_signer(self) -> HMACSHA1Signer:
+        """
+        Get the signer for the current request.
+
+        If a :class:`UserContext` is active, its signer is returned instead of the manager's one.
+
+        :return: The signer.
+        """
+        user_context = current_user_context()
+        if user_context is not None:
+            return user_context.signer
+        if self._signer is None:
+            raise USOSAPIException("Access token not set. Did you forget to authorize?")
+        return self._signer
+
     async def _handle_response_errors(self, response: aiohttp.ClientResponse):
         """
         Handle errors in the response.
@@ -215,7 +270,7 @@ class AuthManager:
         """
         url = f"{self.base_address}{self.REVOKE_TOKEN_SUFFIX}"
         url, headers, body = self._oauth_client.sign(url, http_method="POST")
-        async with self._session.post(url, data=body, headers=headers) as response:
+        async with self.pool.session.post(url, data=body, headers=headers) as response:
             await self._handle_response_errors(response)
             _LOGGER.info("Token revoked successfully.")
 
@@ -227,3 +282,4 @@ class AuthManager:
             return
         await self._revoke_token()
         self.access_token = None
+        self._signer = None
@@ -0,0 +1,613 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, timedelta
+from fnmatch import fnmatchcase
+from typing import NamedTuple
+from urllib.parse import urlencode
+
+from .logger import get_logger
+from .models import Term
+from .utils import match_service_rule
+
+_LOGGER = get_logger("ResponseCache")
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+
+@dataclass
+class CacheRule:
+    """
+    How responses of a service are cached.
+
+    :ivar float | None ttl: How long (in seconds) a response is kept, None to keep it until evicted.
+    :ivar bool shared: Whether the response is the same for every user and can be shared between access tokens. Responses with user-private data must not be shared.
+    """
+
+    ttl: float | None
+    shared: bool = False
+
+
+DEFAULT_CACHE_RULES = {
+    "services/terms/*": CacheRule(ttl=DAY, shared=True),
+    "services/courses/course": CacheRule(ttl=DAY, shared=True),
+    "services/courses/courses": CacheRule(ttl=DAY, shared=True),
+    "services/apiref/*": CacheRule(ttl=7 * DAY, shared=True),
+    "services/apisrv/installation": CacheRule(ttl=DAY, shared=True),
+}
+
+
+@dataclass
+class TermCachePolicy:
+    """
+    How long data belonging to an academic term is cached, depending on whether the term is finished.
+
+    Grades and course editions of finished terms practically never change, so they can be kept for a long time,
+    while data of ongoing terms is refetched.
+
+    :ivar float | None ongoing_ttl: How long (in seconds) data of terms which are not closed is kept, 0 to always refetch it.
+    :ivar float | None closed_ttl: How long (in seconds) data of closed terms is kept, None to keep it until evicted.
+    :ivar timedelta closed_after: How long after its finish date a term is considered closed, leaving time for late grades.
+    """
+
+    ongoing_ttl: float | None = 0
+    closed_ttl: float | None = None
+    closed_after: timedelta = timedelta(days=30)
+
+    def is_closed(self, term: Term | None) -> bool:
+        """
+        Check whether data of a term is not expected to change anymore.
+
+        :param term: The term, None if unknown.
+        :return: True if the term is closed.
+        """
+        if term is None or term.finish_date is None:
+            return False
+        return term.finish_date + self.closed_after < date.today()
+
+    def get_ttl(self, term: Term | None) -> float | None:
+        """
+        Get the time to live of data belonging to a term.
+
+        :param term: The term, None if unknown.
+        :return: The time to live (in seconds), 0 if the data should not be cached.
+        """
+        return self.closed_ttl if self.is_closed(term) else self.ongoing_ttl
+
+
+@dataclass
+class CacheStats:
+    """
+    Snapshot of the cache usage.
+
+    :ivar int hits: Number of lookups that found a response.
+    :ivar int misses: Number of lookups that did not find a fresh response.
+    :ivar int evictions: Number of responses removed to make room for new ones.
+    :ivar int entries: Number of responses currently stored.
+    :ivar int size: Approximate size (in bytes) of the stored responses.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Fraction of lookups that found a response.
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class CacheKey(NamedTuple):
+    """
+    The key of a cached response.
+
+    :ivar str base_address: The base address of the installation the response comes from.
+    :ivar str consumer_key: The consumer key the request is made with.
+    :ivar str service: The service path.
+    :ivar str params: The encoded, sorted request parameters.
+    :ivar str | None scope: The access token the response belongs to, None for shared responses.
+    """
+
+    base_address: str
+    consumer_key: str
+    service: str
+    params: str
+    scope: str | None
+
+
+class CacheBackend(ABC):
+    """
+    Base class of the storages used by :class:`ResponseCache`.
+    """
+
+    @abstractmethod
+    async def get(self, key: CacheKey) -> bytes | None:
+        """
+        Get a stored response.
+
+        :param key: The key of the response.
+        :return: The response body, or None if it is missing or expired.
+        """
+
+    @abstractmethod
+    async def set(self, key: CacheKey, value: bytes, ttl: float | None) -> None:
+        """
+        Store a response.
+
+        :param key: The key of the response.
+        :param value: The response body.
+        :param ttl: How long (in seconds) the response is kept, None to keep it until evicted.
+        """
+
+    @abstractmethod
+    async def invalidate(
+        self, service: str | None = None, scope: str | None = None
+    ) -> int:
+        """
+        Remove stored responses.
+
+        :param service: Pattern of services to remove, e.g. ``services/terms/*``. None for all services.
+        :param scope: The access token whose responses to remove. None for responses of all tokens.
+        :return: Number of removed responses.
+        """
+
+    @abstractmethod
+    def get_stats(self) -> CacheStats:
+        """
+        Get the current usage of the cache.
+
+        :return: The cache statistics.
+        """
+
+    async def close(self) -> None:
+        """
+        Release the resources held by the storage.
+        """
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    An in-process storage with least-recently-used eviction, bounded by the total size of stored responses.
+    """
+
+    def __init__(
+        self, max_size: int = 64 * 1024 * 1024, max_entries: int | None = None
+    ):
+        """
+        Initialize the storage.
+
+        :param max_size: Maximum total size (in bytes) of stored responses.
+        :param max_entries: Maximum number of stored responses, None for no limit.
+        """
+        self.max_size = max_size
+        self.max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, tuple[bytes, float | None]] = OrderedDict()
+        self._size = 0
+        self._stats = CacheStats()
+
+    @staticmethod
+    def _entry_size(key: CacheKey, value: bytes) -> int:
+        return len(value) + sum(len(part or "") for part in key)
+
+    def _remove(self, key: CacheKey) -> None:
+        value, _ = self._entries.pop(key)
+        self._size -= self._entry_size(key, value)
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at is None or expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self._stats.hits += 1
+                return value
+            self._remove(key)
+        self._stats.misses += 1
+        return None
+
+    async def set(self, key: CacheKey, value: bytes, ttl: float | None) -> None:
+        size = self._entry_size(key, value)
+        if size > self.max_size:
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = (value, expires_at)
+        self._size += size
+        while self._size > self.max_size or (
+            self.max_entries is not None and len(self._entries) > self.max_entries
+        ):
+            self._remove(next(iter(self._entries)))
+            self._stats.evictions += 1
+
+    async def invalidate(
+        self, service: str | None = None, scope: str | None = None
+    ) -> int:
+        keys = [
+            key
+            for key in self._entries
+            if (service is None or fnmatchcase(key.service, service))
+            and (scope is None or key.scope == scope)
+        ]
+        for key in keys:
+            self._remove(key)
+        return len(keys)
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            entries=len(self._entries),
+            size=self._size,
+        )
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    A persistent storage in a local SQLite file, which can be shared by many processes and installations.
+
+    Responses are compressed with zlib and evicted by least recent use when the total size exceeds the limit,
+    in batches, down to 90% of the limit. Access tokens are not written to the file, responses are stored under
+    hashes of them. The database uses write-ahead logging, so readers in other processes are not blocked by writers.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            base_address TEXT NOT NULL,
+            consumer_key TEXT NOT NULL,
+            service TEXT NOT NULL,
+            params TEXT NOT NULL,
+            scope TEXT NOT NULL,
+            value BLOB NOT NULL,
+            compressed INTEGER NOT NULL,
+            size INTEGER NOT NULL,
+            expires_at REAL,
+            accessed_at REAL NOT NULL,
+            PRIMARY KEY (base_address, consumer_key, service, params, scope)
+        );
+        CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at);
+        CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at);
+    """
+    _KEY_CONDITION = (
+        "base_address = ? AND consumer_key = ? AND service = ? AND params = ?"
+        " AND scope = ?"
+    )
+    _EVICTION_BATCH = 100
+
+    def __init__(
+        self,
+        path: str = "usos_api_cache.sqlite3",
+        max_size: int = 256 * 1024 * 1024,
+        compress_min_size: int = 512,
+        busy_timeout: float = 30.0,
+    ):
+        """
+        Initialize the storage.
+
+        :param path: Path of the database file, created if it does not exist.
+        :param max_size: Maximum total size (in bytes) of stored, compressed responses.
+        :param compress_min_size: Responses smaller than this (in bytes) are stored uncompressed.
+        :param busy_timeout: How long (in seconds) to wait for other processes holding a lock on the database.
+        """
+        self.path = path
+        self.max_size = max_size
+        self.compress_min_size = compress_min_size
+        self._db = sqlite3.connect(
+            path, timeout=busy_timeout, check_same_thread=False, isolation_level=None
+        )
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self._SCHEMA)
+            # Running total of stored sizes, resynced with the file before evicting
+            self._size = self._get_total_size()
+
+    @staticmethod
+    def _key_params(key: CacheKey) -> tuple:
+        """
+        Get the values of the key columns of a response.
+
+        :param key: The key of the response.
+        :return: The values, with the access token hashed.
+        """
+        return (
+            key.base_address,
+            key.consumer_key,
+            key.service,
+            key.params,
+            SQLiteCacheBackend._hash_scope(key.scope),
+        )
+
+    @staticmethod
+    def _hash_scope(scope: str | None) -> str:
+        """
+        Hash an access token, so it is not stored in the file.
+
+        :param scope: The access token, None for shared responses.
+        :return: The hash, an empty string for shared responses.
+        """
+        return (
+            hashlib.blake2b(scope.encode(), digest_size=16).hexdigest()
+            if scope is not None
+            else ""
+        )
+
+    def _get_total_size(self) -> int:
+        (size,) = self._db.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return size
+
+    def _get(self, key: CacheKey) -> bytes | None:
+        now = time.time()
+        key_params = self._key_params(key)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value, compressed, expires_at, accessed_at FROM responses"
+                f" WHERE {self._KEY_CONDITION}",
+                key_params,
+            ).fetchone()
+            if row is None:
+                return None
+            value, compressed, expires_at, accessed_at = row
+            if expires_at is not None and expires_at <= now:
+                removed = self._db.execute(
+                    f"DELETE FROM responses WHERE {self._KEY_CONDITION}"
+                    " AND expires_at <= ?",
+                    (*key_params, now),
+                ).rowcount
+                self._size -= len(value) * removed
+                return None
+            if now - accessed_at > 60:  # Avoid a write on every read
+                self._db.execute(
+                    f"UPDATE responses SET accessed_at = ? WHERE {self._KEY_CONDITION}",
+                    (now, *key_params),
+                )
+        return zlib.decompress(value) if compressed else value
+
+    def _set(self, key: CacheKey, value: bytes, ttl: float | None) -> None:
+        now = time.time()
+        compressed = len(value) >= self.compress_min_size
+        if compressed:
+            value = zlib.compress(value)
+        if len(value) > self.max_size:
+            return
+        expires_at = now + ttl if ttl is not None else None
+        key_params = self._key_params(key)
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    f"SELECT size FROM responses WHERE {self._KEY_CONDITION}",
+                    key_params,
+                ).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO responses"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (*key_params, value, compressed, len(value), expires_at, now),
+                )
+                size = self._size + len(value) - (row[0] if row else 0)
+                evicted = 0
+                if size > self.max_size:
+                    size, evicted = self._evict(now)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._size = size
+            self._stats.evictions += evicted
+
+    def _evict(self, now: float) -> tuple[int, int]:
+        """
+        Remove expired responses, then the least recently used ones, until the size is below 90% of the limit.
+
+        :param now: The current time.
+        :return: The total size after eviction and the number of evicted responses.
+        """
+        self._db.execute("DELETE FROM responses WHERE expires_at <= ?", (now,))
+        # Other processes may have written to the file since the total was synced
+        size = self._get_total_size()
+        target = self.max_size * 0.9
+        evicted = 0
+        while size > target:
+            rows = self._db.execute(
+                "SELECT rowid, size FROM responses ORDER BY accessed_at LIMIT ?",
+                (self._EVICTION_BATCH,),
+            ).fetchall()
+            if not rows:
+                break
+            batch = []
+            for rowid, row_size in rows:
+                if size <= target:
+                    break
+                batch.append((rowid,))
+                size -= row_size
+            self._db.executemany("DELETE FROM responses WHERE rowid = ?", batch)
+            evicted += len(batch)
+        return size, evicted
+
+    def _invalidate(self, service: str | None, scope: str | None) -> int:
+        conditions, params = [], []
+        if service is not None:
+            conditions.append("service GLOB ?")
+            params.append(service)
+        if scope is not None:
+            conditions.append("scope = ?")
+            params.append(self._hash_scope(scope))
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._lock:
+            removed = self._db.execute(f"DELETE FROM responses{where}", params).rowcount
+            self._size = self._get_total_size()
+        return removed
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        value = await asyncio.to_thread(self._get, key)
+        if value is None:
+            self._stats.misses += 1
+        else:
+            self._stats.hits += 1
+        return value
+
+    async def set(self, key: CacheKey, value: bytes, ttl: float | None) -> None:
+        await asyncio.to_thread(self._set, key, value, ttl)
+
+    async def invalidate(
+        self, service: str | None = None, scope: str | None = None
+    ) -> int:
+        return await asyncio.to_thread(self._invalidate, service, scope)
+
+    def get_stats(self) -> CacheStats:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return CacheStats(
+            hits=self._stats.hits,
+            misses=self._stats.misses,
+            evictions=self._stats.evictions,
+            entries=entries,
+            size=size,
+        )
+
+    async def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    """
+    An opt-in cache of USOS API responses, used by :class:`USOSAPIConnection`.
+
+    Only services matching one of the rules are cached. Responses with user-private data are stored separately for each access token.
+    """
+
+    def __init__(
+        self,
+        backend: CacheBackend | None = None,
+        rules: dict[str, CacheRule] | None = None,
+        term_policy: TermCachePolicy | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        :param backend: The storage to use. If not given, responses are stored in memory.
+        :param rules: Cache rules keyed by service path patterns like ``services/terms/*``, the first matching pattern is used. If not given, :data:`DEFAULT_CACHE_RULES` are used.
+        :param term_policy: The policy for caching grades and course editions per term. If not given, they are not cached.
+        """
+        self.backend = backend or MemoryCacheBackend()
+        self.rules = DEFAULT_CACHE_RULES.copy() if rules is None else rules
+        self.term_policy = term_policy
+
+    def get_rule(self, service: str) -> CacheRule | None:
+        """
+        Get the rule for a service.
+
+        :param service: The service path.
+        :return: The rule, or None if the service is not cached.
+        """
+        rule = match_service_rule(self.rules, service)
+        return rule[1] if rule is not None else None
+
+    @staticmethod
+    def make_key(
+        base_address: str,
+        consumer_key: str,
+        service: str,
+        params: dict,
+        access_token: str | None,
+        shared: bool = False,
+    ) -> CacheKey:
+        """
+        Build the key of a response.
+
+        :param base_address: The base address of the installation.
+        :param consumer_key: The consumer key the request is made with.
+        :param service: The service path.
+        :param params: The request parameters.
+        :param access_token: The access token the request is made with.
+        :param shared: Whether the response is shared between access tokens.
+        :return: The key.
+        """
+        return CacheKey(
+            base_address,
+            consumer_key,
+            service,
+            urlencode(sorted(params.items())),
+            None if shared else access_token,
+        )
+
+    async def get(self, key: CacheKey) -> bytes | None:
+        """
+        Get a cached response.
+
+        :param key: The key of the response.
+        :return: The response body, or None if it is not cached.
+        """
+        return await self.backend.get(key)
+
+    async def set(self, key: CacheKey, value: bytes, ttl: float | None) -> None:
+        """
+        Cache a response.
+
+        :param key: The key of the response.
+        :param value: The response body.
+        :param ttl: How long (in seconds) the response is kept, None to keep it until evicted.
+        """
+        await self.backend.set(key, value, ttl)
+
+    async def set_term_data(
+        self, key: CacheKey, value: bytes, term: Term | None
+    ) -> None:
+        """
+        Cache data belonging to a single term, according to the term policy.
+
+        :param key: The key of the data.
+        :param value: The encoded data.
+        :param term: The term the data belongs to, None if unknown.
+        """
+        ttl = self.term_policy.get_ttl(term)
+        if ttl != 0:
+            await self.backend.set(key, value, ttl)
+
+    async def invalidate(
+        self, service: str | None = None, access_token: str | None = None
+    ) -> int:
+        """
+        Remove cached responses.
+
+        :param service: Pattern of services to remove, e.g. ``services/terms/*``. None for all services.
+        :param access_token: The access token whose responses to remove. None for responses of all tokens.
+        :return: Number of removed responses.
+        """
+        removed = await self.backend.invalidate(service, access_token)
+        _LOGGER.debug(f"Invalidated {removed} cached responses")
+        return removed
+
+    def get_stats(self) -> CacheStats:
+        """
+        Get the current usage of the cache.
+
+        :return: The cache statistics.
+        """
+        return self.backend.get_stats()
+
+    async def close(self) -> None:
+        """
+        Close the storage of the cache.
+        """
+        await self.backend.close()
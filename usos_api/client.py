@@ -1,8 +1,15 @@
 import json
 
+from .cache import ResponseCache
 from .connection import USOSAPIConnection
+from .context import UserContext
+from .entity_store import EntityStore
 from .helper import APIHelper
+from .intern import InternPool
 from .logger import get_logger
+from .pool import ConnectionPool
+from .rate_limit import RateLimiter
+from .retry import RetryPolicy
 from .services import (
     APIDocumentationService,
     APIServerService,
@@ -39,6 +46,13 @@ class USOSClient:
         consumer_key: str,
         consumer_secret: str,
         trust_env: bool = False,
+        pool: ConnectionPool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        coalesce_requests: bool = True,
+        cache: ResponseCache | None = None,
+        intern_pool: InternPool | None = None,
+        entity_store: EntityStore | None = None,
     ) -> None:
         """
         Initialize the USOS API client.
@@ -46,16 +60,35 @@ class USOSClient:
         :param api_base_address: The base address of the USOS API.
         :param consumer_key: Consumer key obtained from the USOS API.
         :param consumer_secret: Consumer secret obtained from the USOS API.
-        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information.
+        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information. Ignored if `pool` is given.
+        :param pool: The connection pool to use. Pass the same pool to many clients to share connections between them.
+        :param rate_limiter: The rate limiter to pass requests through. Pass the same limiter to many clients to limit them together.
+        :param retry_policy: The policy for retrying failed idempotent requests. If not given, failed requests are not retried.
+        :param coalesce_requests: Whether to merge concurrent identical requests into a single upstream request.
+        :param cache: The cache of responses. Pass the same cache to many clients to share it. If not given, responses are not cached.
+        :param intern_pool: The pool deduplicating strings and translations in responses. Pass the same pool to many clients to share it. Deduplicating a response takes about as long as validating it, so use a pool when responses are kept in memory. If not given, responses are not deduplicated.
+        :param entity_store: The store keeping one instance of every term, course and user in responses. Pass the same store to many clients to share it. If not given, every response has its own instances.
         """
         self.connection = USOSAPIConnection(
-            api_base_address, consumer_key, consumer_secret, trust_env
+            api_base_address,
+            consumer_key,
+            consumer_secret,
+            trust_env,
+            pool,
+            rate_limiter,
+            retry_policy,
+            coalesce_requests,
+            cache,
+            intern_pool,
+            entity_store,
         )
         self.user_service = UserService(self.connection)
         self.group_service = GroupService(self.connection)
         self.course_service = CourseService(self.connection)
         self.term_service = TermService(self.connection)
-        self.grade_service = GradeService(self.connection)
+        self.grade_service = GradeService(
+            self.connection, term_service=self.term_service
+        )
         self.api_server_service = APIServerService(self.connection)
         self.api_documentation_service = APIDocumentationService(self.connection)
         self.registration_service = RegistrationService(self.connection)
@@ -161,6 +194,28 @@ class USOSClient:
             access_token, access_token_secret
         )
 
+    def create_user_context(
+        self, access_token: str, access_token_secret: str
+    ) -> UserContext:
+        """
+        Create a lightweight context for making requests on behalf of another user.
+
+        Use it to serve many users with a single client, sharing its connection and services:
+
+        .. code-block:: python
+
+            context = client.create_user_context(access_token, access_token_secret)
+            with context.use():
+                user = await client.user_service.get_user()
+
+        :param access_token: The access token of the user.
+        :param access_token_secret: The access token secret of the user.
+        :return: The user context.
+        """
+        return self.connection.auth_manager.create_user_context(
+            access_token, access_token_secret
+        )
+
     def load_access_token_from_json(self, json_data: dict):
         """
         Load the access token and secret from a JSON object.
@@ -0,0 +1,141 @@
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+from . import json_backend
+from .exceptions import USOSAPIException, USOSAPIHTTPException
+
+# Drift between the local and the server's clock, in seconds per second
+MAX_DRIFT = 100e-6
+
+
+@dataclass
+class ClockSample:
+    """
+    A reading of the server's clock.
+
+    :ivar datetime server_time: The time returned by ``services/apisrv/now``, in the installation's local time.
+    :ivar float local_time: The local monotonic time (``time.monotonic``) half way through the request.
+    :ivar float round_trip: How long (in seconds) the request took.
+    """
+
+    server_time: datetime
+    local_time: float
+    round_trip: float
+
+
+class ServerClock:
+    """
+    An estimate of the USOS server's clock, measured with ``services/apisrv/now``.
+
+    The server time is read a few times and the reading with the smallest error is kept: half of its round trip,
+    plus the possible drift of the clocks since it was taken.
+    Times are tied to the local monotonic clock, so changes of the local wall clock do not affect them.
+    Server times are naive datetimes in the installation's local time, like all dates returned by the API.
+    """
+
+    def __init__(self, connection):
+        """
+        Initialize the clock.
+
+        :param connection: The connection to the installation.
+        """
+        self.connection = connection
+        self.reference: ClockSample | None = None
+
+    async def sample(self) -> ClockSample:
+        """
+        Read the server's clock once. The reading is kept if its error is smaller than the current reference's.
+
+        :return: The reading.
+        :raises USOSAPIHTTPException: If the server returns an error.
+        """
+        url = f"{self.connection.base_address}services/apisrv/now"
+        started = time.monotonic()
+        async with self.connection.pool.session.post(url) as response:
+            body = await response.read()
+            finished = time.monotonic()
+            if response.status != 200:
+                raise USOSAPIHTTPException(
+                    f"HTTP {response.status}: {body.decode(errors='replace')}",
+                    response.status,
+                )
+        sample = ClockSample(
+            datetime.fromisoformat(json_backend.loads(body)),
+            (started + finished) / 2,
+            finished - started,
+        )
+        if self.reference is None or self._get_error(sample) <= self._get_error(
+            self.reference
+        ):
+            self.reference = sample
+        return sample
+
+    async def sync(self, samples: int = 5) -> ClockSample:
+        """
+        Read the server's clock a few times, one after another, and keep the most accurate reading.
+
+        :param samples: The number of readings.
+        :return: The most accurate reading.
+        """
+        self.reference = None
+        for _ in range(samples):
+            await self.sample()
+        return self.reference
+
+    @property
+    def error(self) -> float:
+        """
+        The maximum error (in seconds) of the estimate.
+
+        :raises USOSAPIException: If the clock was not synced.
+        """
+        return self._get_error(self._get_reference())
+
+    def now(self) -> datetime:
+        """
+        Estimate the current server time.
+
+        :return: The server time.
+        :raises USOSAPIException: If the clock was not synced.
+        """
+        reference = self._get_reference()
+        return reference.server_time + timedelta(
+            seconds=time.monotonic() - reference.local_time
+        )
+
+    def to_monotonic(self, server_time: datetime) -> float:
+        """
+        Convert a server time to the local monotonic clock.
+
+        :param server_time: The server time, e.g. ``RegistrationRound.start_date``.
+        :return: The corresponding value of ``time.monotonic()``.
+        :raises USOSAPIException: If the clock was not synced.
+        """
+        reference = self._get_reference()
+        return (
+            reference.local_time + (server_time - reference.server_time).total_seconds()
+        )
+
+    @staticmethod
+    def _get_error(sample: ClockSample) -> float:
+        """
+        Get the maximum error of an estimate based on a reading.
+
+        :param sample: The reading.
+        :return: The error, in seconds.
+        """
+        return (
+            sample.round_trip / 2 + (time.monotonic() - sample.local_time) * MAX_DRIFT
+        )
+
+    def _get_reference(self) -> ClockSample:
+        """
+        Get the reference reading.
+
+        :return: The reading.
+        :raises USOSAPIException: If the clock was not synced.
+        """
+        if self.reference is None:
+            raise USOSAPIException("The server clock was not synced, call sync first.")
+        return self.reference
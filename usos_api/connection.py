@@ -1,10 +1,19 @@
-from urllib.parse import urlencode, urlparse
+import asyncio
+from contextlib import nullcontext
+from typing import Any
 
 import aiohttp
 
 from .auth import AuthManager
-from .exceptions import USOSAPIException
+from .cache import CacheKey, CacheRule, ResponseCache
+from .endpoint import Endpoint
+from .entity_store import EntityStore
+from .exceptions import USOSAPIHTTPException
+from .intern import InternPool
 from .logger import get_logger
+from .pool import ConnectionPool
+from .rate_limit import RateLimiter
+from .retry import RETRYABLE_ERRORS, RetryPolicy, parse_retry_after
 
 _LOGGER = get_logger("usos-api")
 _DOWNLOAD_LOGGER = get_logger("usos-api-download")
@@ -21,6 +30,13 @@ class USOSAPIConnection:
         consumer_key: str,
         consumer_secret: str,
         trust_env: bool = False,
+        pool: ConnectionPool | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_policy: RetryPolicy | None = None,
+        coalesce_requests: bool = True,
+        cache: ResponseCache | None = None,
+        intern_pool: InternPool | None = None,
+        entity_store: EntityStore | None = None,
     ):
         """
         Initialize the USOS API connection.
@@ -28,14 +44,29 @@ class USOSAPIConnection:
         :param api_base_address: The base address of the USOS API.
         :param consumer_key: Consumer key obtained from the USOS API.
         :param consumer_secret: Consumer secret obtained from the USOS API.
-        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information.
+        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information. Ignored if `pool` is given.
+        :param pool: The connection pool to use, can be shared between many connections. If not given, a new pool is created.
+        :param rate_limiter: The rate limiter to pass requests through, can be shared between many connections. If not given, requests are not limited.
+        :param retry_policy: The policy for retrying failed idempotent requests, can be shared between many connections to share its retry budget. If not given, requests are not retried.
+        :param coalesce_requests: Whether to merge concurrent identical requests (same service, parameters and access token) into a single upstream request.
+        :param cache: The cache of responses, can be shared between many connections. If not given, responses are not cached.
+        :param intern_pool: The pool deduplicating strings and translations in deserialized responses, can be shared between many connections. Deduplicating a response takes about as long as validating it, so use a pool when responses are kept in memory. If not given, responses are not deduplicated.
+        :param entity_store: The store keeping one instance of every term, course and user in deserialized responses, can be shared between many connections. If not given, every response has its own instances.
         """
         self.base_address = api_base_address.rstrip("/") + "/"
+        self.pool = pool or ConnectionPool(trust_env=trust_env)
         self.auth_manager = AuthManager(
-            self.base_address, consumer_key, consumer_secret, trust_env
+            self.base_address, consumer_key, consumer_secret, trust_env, self.pool
         )
-        self._session = None
         self.trust_env = trust_env
+        self.rate_limiter = rate_limiter
+        self.retry_policy = retry_policy
+        self.coalesce_requests = coalesce_requests
+        self.cache = cache
+        self.intern_pool = intern_pool
+        self.entity_store = entity_store
+        self._in_flight: dict[tuple, asyncio.Task] = {}
+        self._endpoints: dict[str, Endpoint] = {}
 
     async def __aenter__(self) -> "USOSAPIConnection":
         """
@@ -60,16 +91,15 @@ class USOSAPIConnection:
         """
         Open the connection.
         """
-        self._session = aiohttp.ClientSession(trust_env=self.trust_env)
+        await self.pool.open()
         await self.auth_manager.open()
 
     async def close(self):
         """
         Close the connection.
         """
-        if self._session:
-            await self._session.close()
         await self.auth_manager.close()
+        await self.pool.close()
 
     async def test_connection(self) -> bool:
         """
@@ -77,9 +107,56 @@ class USOSAPIConnection:
         :return: True if the connection is successful, False otherwise.
         """
         url = f"{self.base_address}services/apisrv/now"
-        async with self._session.get(url) as response:
+        async with self.pool.session.get(url) as response:
             return response.status == 200
 
+    def _limit(self, service: str):
+        """
+        Get the rate limiter context for a request.
+
+        :param service: The service to call.
+        :return: An async context manager holding the request's rate limiter slot.
+        """
+        if self.rate_limiter is None:
+            return nullcontext()
+        return self.rate_limiter.acquire(self.auth_manager.consumer_key, service)
+
+    def endpoint(
+        self,
+        service: str,
+        fields: str | list[str] | None = None,
+        response_type: Any = None,
+        **params,
+    ) -> Endpoint:
+        """
+        Get a reusable descriptor of a service, with the URL and the static parameters prepared once.
+
+        Endpoints without static parameters are cached, so asking for the same service twice returns the same endpoint.
+
+        :param service: The service to call.
+        :param fields: The default fields to request.
+        :param response_type: The shape to validate responses into, e.g. ``dict[str, Course | None]``. If not given, responses are returned as decoded JSON.
+        :param params: Parameters sent with every call.
+        :return: The endpoint.
+        """
+        if fields is not None or response_type is not None or params:
+            return Endpoint(self, service, fields, response_type, **params)
+        endpoint = self._endpoints.get(service)
+        if endpoint is None:
+            endpoint = self._endpoints[service] = Endpoint(self, service)
+        return endpoint
+
+    def resolve_entities(self, value: Any) -> Any:
+        """
+        Replace terms, courses and users in deserialized models with their canonical instances from the entity store.
+
+        :param value: A model, or a list or dictionary of models.
+        :return: The value, with entities replaced. If the connection has no entity store, the value is returned unchanged.
+        """
+        if self.entity_store is None:
+            return value
+        return self.entity_store.resolve(value, self.auth_manager.get_token_identity())
+
     async def get(self, service: str, **kwargs) -> dict:
         """
         Perform a GET request to the USOS API.
@@ -91,18 +168,7 @@ class USOSAPIConnection:
         :param kwargs: The parameters to pass.
         :return: The response data.
         """
-        kwargs = {k: str(v) for k, v in kwargs.items() if v is not None}
-        headers = {}
-        url_parts = [f"{self.base_address}{service}"]
-        query_string = urlparse(url_parts[0]).query
-        url_parts.append("&" if query_string else "?")
-        url_parts.append(urlencode(kwargs))
-        url, headers, body = self.auth_manager.sign_request(
-            "".join(url_parts), headers=headers
-        )
-        async with self._session.get(url, params=kwargs, headers=headers) as response:
-            await self._handle_response_errors(response)
-            return await response.json()
+        return await self.endpoint(service).get(**kwargs)
 
     async def post(self, service: str, **kwargs) -> dict:
         """
@@ -115,30 +181,165 @@ class USOSAPIConnection:
         :param kwargs: The parameters to pass.
         :return: The response data.
         """
-        kwargs = {k: str(v) for k, v in kwargs.items() if v is not None}
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        url = f"{self.base_address}{service}"
-        url, headers, body = self.auth_manager.sign_request(
-            url, http_method="POST", body=kwargs, headers=headers
-        )
-        async with self._session.post(url, data=body, headers=headers) as response:
-            await self._handle_response_errors(response)
-            return await response.json()
+        return await self.endpoint(service).post(**kwargs)
+
+    async def _request(
+        self, http_method: str, endpoint: Endpoint, params: dict[str, str]
+    ) -> bytes:
+        """
+        Perform a request, using the cache and sharing the response with identical requests already in flight.
+
+        Each caller gets the raw response body and decodes it on its own, so callers never share mutable data.
+
+        :param http_method: The HTTP method to use.
+        :param endpoint: The endpoint to call.
+        :param params: The prepared parameters.
+        :return: The raw response body.
+        """
+        if not endpoint.idempotent:
+            return await self._request_with_retries(http_method, endpoint, params)
+
+        service = endpoint.service
+        token = self.auth_manager.get_token_identity()
+        cache_rule = self.cache.get_rule(service) if self.cache is not None else None
+        cache_key = None
+        if cache_rule is not None:
+            cache_key = self.cache.make_key(
+                self.base_address,
+                self.auth_manager.consumer_key,
+                service,
+                params,
+                token,
+                cache_rule.shared,
+            )
+            body = await self.cache.get(cache_key)
+            if body is not None:
+                return body
+
+        if not self.coalesce_requests:
+            return await self._fetch(
+                http_method, endpoint, params, cache_key, cache_rule
+            )
+
+        key = (service, tuple(sorted(params.items())), token)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(
+                self._fetch(http_method, endpoint, params, cache_key, cache_rule)
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t: self._on_request_done(key, t))
+        # Shield the shared request, so a cancelled caller does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch(
+        self,
+        http_method: str,
+        endpoint: Endpoint,
+        params: dict[str, str],
+        cache_key: CacheKey | None,
+        cache_rule: CacheRule | None,
+    ) -> bytes:
+        """
+        Fetch a response from the USOS API and store it in the cache.
+
+        :param http_method: The HTTP method to use.
+        :param endpoint: The endpoint to call.
+        :param params: The prepared parameters.
+        :param cache_key: The key to cache the response under, None if the response is not cached.
+        :param cache_rule: The cache rule of the service, None if the response is not cached.
+        :return: The raw response body.
+        """
+        body = await self._request_with_retries(http_method, endpoint, params)
+        if cache_key is not None:
+            await self.cache.set(cache_key, body, cache_rule.ttl)
+        return body
+
+    def _on_request_done(self, key: tuple, task: asyncio.Task) -> None:
+        """
+        Forget a finished shared request.
+
+        :param key: The key of the request.
+        :param task: The finished request.
+        """
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved in case all callers were cancelled
+
+    async def _request_with_retries(
+        self, http_method: str, endpoint: Endpoint, params: dict[str, str]
+    ) -> bytes:
+        """
+        Perform a request, retrying it according to the retry policy.
+
+        :param http_method: The HTTP method to use.
+        :param endpoint: The endpoint to call.
+        :param params: The prepared parameters.
+        :return: The raw response body.
+        """
+        policy = self.retry_policy
+        if policy is None or not policy.is_retryable_service(endpoint.service):
+            return await self._send(http_method, endpoint, params)
+
+        policy.budget.deposit()
+        attempt = 0
+        waited = 0.0
+        while True:
+            try:
+                return await self._send(http_method, endpoint, params)
+            except RETRYABLE_ERRORS as e:
+                delay = policy.get_retry_delay(attempt, e, waited)
+                if delay is None:
+                    raise
+                attempt += 1
+                waited += delay
+                _LOGGER.warning(
+                    f"Request to {endpoint.service} failed ({e!r}), retry {attempt} in {delay:.2f}s"
+                )
+                await asyncio.sleep(delay)
+
+    async def _send(
+        self, http_method: str, endpoint: Endpoint, params: dict[str, str]
+    ) -> bytes:
+        """
+        Sign and send a single request.
+
+        :param http_method: The HTTP method to use.
+        :param endpoint: The endpoint to call.
+        :param params: The prepared parameters.
+        :return: The raw response body.
+        """
+        async with self._limit(endpoint.service):
+            # Signed inside the limiter, so the OAuth timestamp is fresh when the request is sent
+            url, headers, body = endpoint.prepare_request(http_method, params)
+            async with self.pool.session.request(
+                http_method, url, data=body, headers=headers
+            ) as response:
+                await self._handle_response_errors(response)
+                return await response.read()
 
     async def _handle_response_errors(self, response: aiohttp.ClientResponse):
         """
         Handle errors in the response.
 
         :param response: The response to handle.
-        :raises USOSAPIException: If an error occurred.
+        :raises USOSAPIHTTPException: If an error occurred.
         """
         if response.status != 200:
             text = await response.text()
             if response.status == 401:
-                raise USOSAPIException(
-                    f"HTTP 401: Unauthorized. Your access key probably expired. {text}"
+                raise USOSAPIHTTPException(
+                    f"HTTP 401: Unauthorized. Your access key probably expired. {text}",
+                    response.status,
                 )
             elif response.status == 400:
-                raise USOSAPIException(f"HTTP 400: Bad request: {text}")
+                raise USOSAPIHTTPException(
+                    f"HTTP 400: Bad request: {text}", response.status
+                )
             else:
-                raise USOSAPIException(f"HTTP {response.status}: {text}")
+                raise USOSAPIHTTPException(
+                    f"HTTP {response.status}: {text}",
+                    response.status,
+                    parse_retry_after(response.headers.get("Retry-After")),
+                )
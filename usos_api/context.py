@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from .signing import HMACSHA1Signer
+
+_CURRENT_USER_CONTEXT: ContextVar["UserContext | None"] = ContextVar(
+    "usos_api_user_context", default=None
+)
+
+
+def current_user_context() -> "UserContext | None":
+    """
+    Get the user context active in the current task.
+
+    :return: The active user context, or None if requests are made with the client's own token.
+    """
+    return _CURRENT_USER_CONTEXT.get()
+
+
+class UserContext:
+    """
+    Credentials of a single user, used to make requests on their behalf through a shared client.
+
+    A user context holds only the access token pair and its signer, so it is cheap to keep thousands of them.
+    All requests made inside :meth:`use` are signed with this user's token, while the connection, the pool and the services of the client are shared.
+    The context is bound to the consumer of the client that created it.
+    """
+
+    __slots__ = ("access_token", "access_token_secret", "signer")
+
+    def __init__(
+        self,
+        consumer_key: str,
+        consumer_secret: str,
+        access_token: str,
+        access_token_secret: str,
+    ):
+        """
+        Initialize the user context.
+
+        :param consumer_key: Consumer key obtained from the USOS API.
+        :param consumer_secret: Consumer secret obtained from the USOS API.
+        :param access_token: The access token of the user.
+        :param access_token_secret: The access token secret of the user.
+        """
+        self.access_token = access_token
+        self.access_token_secret = access_token_secret
+        self.signer = HMACSHA1Signer(
+            consumer_key, consumer_secret, access_token, access_token_secret
+        )
+
+    def __repr__(self) -> str:
+        return f"UserContext(access_token={self.access_token!r})"
+
+    @contextmanager
+    def use(self) -> Iterator["UserContext"]:
+        """
+        Make requests on behalf of this user inside the ``with`` block.
+
+        The context is bound to the current task (and the tasks it creates), so many users can be served concurrently by one client.
+
+        :return: The user context.
+        """
+        reset_token = _CURRENT_USER_CONTEXT.set(self)
+        try:
+            yield self
+        finally:
+            _CURRENT_USER_CONTEXT.reset(reset_token)
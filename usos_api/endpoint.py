@@ -0,0 +1,200 @@
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any
+
+from pydantic import TypeAdapter
+from yarl import URL
+
+from . import json_backend
+from .retry import is_idempotent_service
+from .signing import escape
+
+if TYPE_CHECKING:
+    from .connection import USOSAPIConnection
+
+_FORM_CONTENT_TYPE = "application/x-www-form-urlencoded"
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_type: Any) -> TypeAdapter:
+    """
+    Get a type adapter for a response shape, built once per shape.
+
+    :param response_type: The response shape, e.g. ``dict[str, Course | None]``.
+    :return: The type adapter.
+    """
+    return TypeAdapter(response_type)
+
+
+def encode_param(value: Any) -> str:
+    """
+    Encode a parameter value as sent to the USOS API, which expects booleans as ``true`` / ``false``.
+
+    :param value: The value, not None.
+    :return: The encoded value.
+    """
+    if value.__class__ is str:
+        return value
+    if value.__class__ is bool:
+        return "true" if value else "false"
+    return str(value)
+
+
+class Endpoint:
+    """
+    A reusable descriptor of a USOS API service, created with :meth:`USOSAPIConnection.endpoint`.
+
+    The absolute URL, the static parameters and the default ``fields`` are prepared once,
+    so each call only encodes its own parameters, signs the request and sends it.
+
+    If the endpoint has a response type, responses are validated into it straight from the raw bytes,
+    without building intermediate dictionaries. Otherwise they are decoded with the current JSON backend.
+    """
+
+    __slots__ = (
+        "connection",
+        "service",
+        "url",
+        "static_params",
+        "idempotent",
+        "adapter",
+        "_escaped_static_params",
+    )
+
+    def __init__(
+        self,
+        connection: "USOSAPIConnection",
+        service: str,
+        fields: str | list[str] | None = None,
+        response_type: Any = None,
+        **static_params: Any,
+    ):
+        """
+        Initialize the endpoint.
+
+        :param connection: The connection to send requests through.
+        :param service: The service path, e.g. ``services/terms/terms``.
+        :param fields: The default fields to request, can be overridden per call.
+        :param response_type: The shape to validate responses into, e.g. ``dict[str, Course | None]``. If not given, responses are returned as decoded JSON.
+        :param static_params: Parameters sent with every call, can be overridden per call.
+        """
+        self.connection = connection
+        self.service = service
+        self.url = f"{connection.base_address}{service}"
+        if fields is not None:
+            static_params["fields"] = (
+                fields if isinstance(fields, str) else "|".join(fields)
+            )
+        self.static_params = {
+            key: encode_param(value)
+            for key, value in static_params.items()
+            if value is not None
+        }
+        self._escaped_static_params = {
+            key: (escape(key), escape(value))
+            for key, value in self.static_params.items()
+        }
+        self.idempotent = is_idempotent_service(service)
+        self.adapter = (
+            get_type_adapter(response_type) if response_type is not None else None
+        )
+
+    def __repr__(self) -> str:
+        return f"Endpoint({self.service!r})"
+
+    def prepare_params(self, params: dict[str, Any]) -> dict[str, str]:
+        """
+        Merge call parameters with the static ones, dropping None values and encoding the others with :func:`encode_param`.
+
+        :param params: The call parameters.
+        :return: The parameters to send.
+        """
+        merged = self.static_params.copy()
+        for key, value in params.items():
+            if value is None:
+                merged.pop(key, None)
+            else:
+                merged[key] = encode_param(value)
+        return merged
+
+    def prepare_request(
+        self, http_method: str, params: dict[str, str]
+    ) -> tuple[str | URL, dict[str, str], bytes | None]:
+        """
+        Encode and sign a request.
+
+        :param http_method: The HTTP method to use.
+        :param params: The prepared parameters.
+        :return: The URL, headers and body of the request.
+        """
+        static_params = self.static_params
+        escaped_static_params = self._escaped_static_params
+        pairs = []
+        for key, value in params.items():
+            if static_params.get(key) is value:
+                pairs.append(escaped_static_params[key])
+            else:
+                pairs.append((escape(key), escape(value)))
+        # The same encoded pairs are signed and sent, so each parameter is encoded once
+        headers = {
+            "Authorization": self.connection.auth_manager.get_signer().sign_escaped(
+                http_method, self.url, pairs
+            )
+        }
+        encoded = "&".join([f"{key}={value}" for key, value in pairs])
+        if http_method == "GET":
+            url = URL(f"{self.url}?{encoded}", encoded=True) if encoded else self.url
+            return url, headers, None
+        headers["Content-Type"] = _FORM_CONTENT_TYPE
+        return self.url, headers, encoded.encode("ascii")
+
+    def decode(self, body: bytes) -> Any:
+        """
+        Decode a raw response body.
+
+        :param body: The raw response body.
+        :return: The response validated into the response type, or the decoded JSON if the endpoint has none.
+        """
+        if self.adapter is not None:
+            data = self.adapter.validate_json(body)
+            data = self.connection.resolve_entities(data)
+        else:
+            data = json_backend.loads(body)
+        if self.connection.intern_pool is not None:
+            data = self.connection.intern_pool.intern(data)
+        return data
+
+    async def get_raw(self, **params: Any) -> bytes:
+        """
+        Perform a GET request and return the raw response body.
+
+        :param params: The parameters to pass.
+        :return: The raw response body.
+        """
+        return await self.connection._request("GET", self, self.prepare_params(params))
+
+    async def post_raw(self, **params: Any) -> bytes:
+        """
+        Perform a POST request and return the raw response body.
+
+        :param params: The parameters to pass.
+        :return: The raw response body.
+        """
+        return await self.connection._request("POST", self, self.prepare_params(params))
+
+    async def get(self, **params: Any) -> Any:
+        """
+        Perform a GET request.
+
+        :param params: The parameters to pass.
+        :return: The response data.
+        """
+        return self.decode(await self.get_raw(**params))
+
+    async def post(self, **params: Any) -> Any:
+        """
+        Perform a POST request.
+
+        :param params: The parameters to pass.
+        :return: The response data.
+        """
+        return self.decode(await self.post_raw(**params))
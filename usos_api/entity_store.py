@@ -0,0 +1,164 @@
+from dataclasses import dataclass
+from typing import Any, TypeVar
+from weakref import WeakValueDictionary
+
+from pydantic import BaseModel
+
+from .models import Course, Term, User
+
+_T = TypeVar("_T")
+_M = TypeVar("_M", bound=BaseModel)
+
+
+@dataclass(frozen=True)
+class EntityType:
+    """
+    How instances of a model are identified in an :class:`EntityStore`.
+
+    :ivar str id_field: The field holding the ID of the entity. Instances without an ID are not stored.
+    :ivar bool shared: Whether the entity is the same for every user and can be shared between access tokens. Entities with user-private fields must not be shared.
+    """
+
+    id_field: str = "id"
+    shared: bool = False
+
+
+DEFAULT_ENTITY_TYPES = {
+    Term: EntityType(shared=True),
+    Course: EntityType(shared=True),
+    User: EntityType(),
+}
+
+
+@dataclass
+class EntityStoreStats:
+    """
+    Statistics of an entity store.
+    """
+
+    entities: int = 0
+    hits: int = 0
+    merged_fields: int = 0
+
+
+class EntityStore:
+    """
+    Keeps one canonical instance of every entity (term, course, user) found in deserialized responses.
+
+    With a store, every response is walked after it is deserialized and entities already in the store are replaced
+    with their canonical instance, so e.g. the term of a group, of a course edition and of a cart entry is the same object.
+    The fields set in a later, possibly partial, response are merged into the canonical instance, so it is updated
+    for everyone holding it. Instances are kept only as long as they are used.
+
+    Entities which are not shared are kept separately for each access token, so fields visible to one user are never
+    merged into instances returned to another.
+    """
+
+    def __init__(self, entity_types: dict[type[BaseModel], EntityType] | None = None):
+        """
+        Initialize the store.
+
+        :param entity_types: The models stored, with how they are identified. If not given, :data:`DEFAULT_ENTITY_TYPES` is used.
+        """
+        self.entity_types = dict(
+            DEFAULT_ENTITY_TYPES if entity_types is None else entity_types
+        )
+        self._entities: WeakValueDictionary[tuple, BaseModel] = WeakValueDictionary()
+        self._stats = EntityStoreStats()
+
+    def _get_key(
+        self, model: type[BaseModel], entity_id: Any, scope: str | None
+    ) -> tuple:
+        """
+        Get the key of an entity.
+
+        :param model: The model of the entity.
+        :param entity_id: The ID of the entity.
+        :param scope: The access token the entity was fetched with.
+        :return: The key.
+        """
+        return model, entity_id, None if self.entity_types[model].shared else scope
+
+    def resolve(self, value: _T, scope: str | None = None) -> _T:
+        """
+        Replace entities in a deserialized value with their canonical instances, in place.
+
+        :param value: A model, a list or dictionary of models, or decoded JSON.
+        :param scope: The access token the value was fetched with.
+        :return: The value, with entities replaced. An entity is returned as its canonical instance.
+        """
+        value_class = value.__class__
+        if value_class is list:
+            for index, item in enumerate(value):
+                value[index] = self.resolve(item, scope)
+        elif value_class is dict:
+            for key, item in value.items():
+                value[key] = self.resolve(item, scope)
+        elif isinstance(value, BaseModel):
+            fields = value.__dict__
+            for name, item in fields.items():
+                fields[name] = self.resolve(item, scope)
+            entity_type = self.entity_types.get(value_class)
+            if entity_type is not None:
+                return self._resolve_entity(value, entity_type, scope)
+        return value
+
+    def _resolve_entity(
+        self, value: BaseModel, entity_type: EntityType, scope: str | None
+    ) -> BaseModel:
+        """
+        Get the canonical instance of an entity, merging the fields set in the given instance into it.
+
+        :param value: The entity.
+        :param entity_type: How the entity is identified.
+        :param scope: The access token the entity was fetched with.
+        :return: The canonical instance.
+        """
+        entity_id = value.__dict__.get(entity_type.id_field)
+        if entity_id is None:
+            return value
+        key = self._get_key(value.__class__, entity_id, scope)
+        canonical = self._entities.get(key)
+        if canonical is None:
+            self._entities[key] = value
+            return value
+        if canonical is value:
+            return value
+        self._stats.hits += 1
+        fields_set = value.model_fields_set
+        fields = canonical.__dict__
+        for name in fields_set:
+            fields[name] = value.__dict__[name]
+        canonical.__pydantic_fields_set__.update(fields_set)
+        self._stats.merged_fields += len(fields_set)
+        return canonical
+
+    def get(
+        self, model: type[_M], entity_id: Any, scope: str | None = None
+    ) -> _M | None:
+        """
+        Get the canonical instance of an entity.
+
+        :param model: The model of the entity.
+        :param entity_id: The ID of the entity.
+        :param scope: The access token the entity was fetched with, ignored for shared entities.
+        :return: The canonical instance, or None if it is not in the store.
+        """
+        return self._entities.get(self._get_key(model, entity_id, scope))
+
+    def get_stats(self) -> EntityStoreStats:
+        """
+        Get statistics of the store.
+
+        :return: The number of stored entities, how many times they were reused and how many fields were merged into them.
+        """
+        return EntityStoreStats(
+            len(self._entities), self._stats.hits, self._stats.merged_fields
+        )
+
+    def clear(self) -> None:
+        """
+        Forget all entities and reset the statistics.
+        """
+        self._entities.clear()
+        self._stats = EntityStoreStats()
@@ -1,2 +1,16 @@
 class USOSAPIException(Exception):
     pass
+
+
+class USOSAPIHTTPException(USOSAPIException):
+    """
+    An error response returned by the USOS API.
+
+    :ivar int status: The HTTP status code.
+    :ivar float | None retry_after: Number of seconds the server asked to wait before retrying, if given.
+    """
+
+    def __init__(self, message: str, status: int, retry_after: float | None = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
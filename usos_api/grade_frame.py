@@ -0,0 +1,311 @@
+import math
+from typing import Iterable, Sequence
+
+from .models import Grade
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _require_numpy() -> None:
+    """
+    Check that NumPy is installed.
+
+    :raises ImportError: If NumPy is not installed.
+    """
+    if np is None:
+        raise ImportError("numpy is not installed, install usos-api[numpy] to use it.")
+
+
+def _encode(labels: dict, label) -> int:
+    """
+    Get the code of a label, adding the label if it is new.
+
+    :param labels: The labels seen so far, mapped to their codes.
+    :param label: The label.
+    :return: The code.
+    """
+    code = labels.get(label)
+    if code is None:
+        code = labels[label] = len(labels)
+    return code
+
+
+class GradeFrame:
+    """
+    Grades stored column by column in NumPy arrays, for computing averages over many grades at once.
+
+    Every grade is a row. Terms and courses are stored as codes indexing :attr:`terms` and :attr:`courses`.
+    Missing values and weights are NaN, missing ``passes`` is false and missing ``counts_into_average`` is true.
+    Requires NumPy, install it with the ``numpy`` extra.
+
+    :ivar numpy.ndarray value: The numeric values of grades.
+    :ivar numpy.ndarray weight: The weights of grades, e.g. ECTS points of their courses.
+    :ivar numpy.ndarray passes: Whether grades are passing.
+    :ivar numpy.ndarray counts_into_average: Whether grades count into averages.
+    :ivar numpy.ndarray term_codes: The terms of grades, as indexes into :attr:`terms`.
+    :ivar numpy.ndarray course_codes: The courses of grades, as indexes into :attr:`courses`.
+    :ivar list terms: The IDs of terms.
+    :ivar list courses: The IDs of courses.
+    """
+
+    def __init__(
+        self,
+        value: "np.ndarray",
+        weight: "np.ndarray",
+        passes: "np.ndarray",
+        counts_into_average: "np.ndarray",
+        term_codes: "np.ndarray",
+        course_codes: "np.ndarray",
+        terms: list[str | None],
+        courses: list[str | None],
+    ):
+        """
+        Initialize the frame from its columns.
+
+        :raises ImportError: If NumPy is not installed.
+        """
+        _require_numpy()
+        self.value = value
+        self.weight = weight
+        self.passes = passes
+        self.counts_into_average = counts_into_average
+        self.term_codes = term_codes
+        self.course_codes = course_codes
+        self.terms = terms
+        self.courses = courses
+
+    @classmethod
+    def _from_rows(
+        cls,
+        rows: Iterable[tuple[Grade, str | None, str | None, float | None]],
+    ) -> "GradeFrame":
+        """
+        Build a frame from grades with their terms, courses and weights.
+
+        :param rows: Tuples of a grade, its term ID, its course ID and its weight.
+        :return: The frame.
+        """
+        _require_numpy()
+        values, weights, passes, counts_into_average = [], [], [], []
+        term_codes, course_codes = [], []
+        terms, courses = {}, {}
+        for grade, term_id, course_id, weight in rows:
+            values.append(grade.value)
+            weights.append(weight)
+            passes.append(bool(grade.passes))
+            counts_into_average.append(grade.counts_into_average is not False)
+            term_codes.append(_encode(terms, term_id))
+            course_codes.append(_encode(courses, course_id))
+        return cls(
+            np.array(values, dtype=np.float64),
+            np.array(weights, dtype=np.float64),
+            np.array(passes, dtype=np.bool_),
+            np.array(counts_into_average, dtype=np.bool_),
+            np.array(term_codes, dtype=np.intp),
+            np.array(course_codes, dtype=np.intp),
+            list(terms),
+            list(courses),
+        )
+
+    @classmethod
+    def from_grades(cls, grades: Iterable[Grade]) -> "GradeFrame":
+        """
+        Build a frame from grades, e.g. from :meth:`APIHelper.get_user_end_grades_with_weights`.
+
+        Terms and courses are taken from the ``course_edition`` of grades, weights from their ``weight``.
+
+        :param grades: The grades.
+        :return: The frame.
+        """
+        return cls._from_rows(
+            (
+                grade,
+                grade.course_edition.term_id if grade.course_edition else None,
+                grade.course_edition.course_id if grade.course_edition else None,
+                grade.weight,
+            )
+            for grade in grades
+        )
+
+    @classmethod
+    def from_terms_grades(
+        cls,
+        grades_by_term: dict[str, dict[str, dict[str, dict[str, Grade] | list[Grade]]]],
+        weights: dict[str, dict[str, float | None]] | None = None,
+    ) -> "GradeFrame":
+        """
+        Build a frame from the final course grades returned by :meth:`GradeService.get_grades_by_terms`.
+
+        :param grades_by_term: The grades, keyed by term ID and course ID.
+        :param weights: The weights of courses keyed by term ID and course ID, e.g. from :meth:`CourseService.get_user_courses_ects`. If not given, grades have no weights.
+        :return: The frame.
+        """
+        weights = weights or {}
+        return cls._from_rows(
+            (grade, term_id, course_id, weights.get(term_id, {}).get(course_id))
+            for term_id, courses in grades_by_term.items()
+            for course_id, course in courses.items()
+            for grade in course.get("course_grades", [])
+        )
+
+    @classmethod
+    def concat(cls, frames: Sequence["GradeFrame"]) -> "GradeFrame":
+        """
+        Join frames, e.g. of many students, into one.
+
+        :param frames: The frames.
+        :return: The joined frame.
+        """
+        _require_numpy()
+        terms, courses = {}, {}
+        term_codes, course_codes = [], []
+        for frame in frames:
+            term_map = np.array(
+                [_encode(terms, term_id) for term_id in frame.terms], dtype=np.intp
+            )
+            course_map = np.array(
+                [_encode(courses, course_id) for course_id in frame.courses],
+                dtype=np.intp,
+            )
+            term_codes.append(term_map[frame.term_codes])
+            course_codes.append(course_map[frame.course_codes])
+        return cls(
+            np.concatenate([frame.value for frame in frames] or [np.empty(0)]),
+            np.concatenate([frame.weight for frame in frames] or [np.empty(0)]),
+            np.concatenate(
+                [frame.passes for frame in frames] or [np.empty(0, dtype=np.bool_)]
+            ),
+            np.concatenate(
+                [frame.counts_into_average for frame in frames]
+                or [np.empty(0, dtype=np.bool_)]
+            ),
+            np.concatenate(term_codes or [np.empty(0, dtype=np.intp)]),
+            np.concatenate(course_codes or [np.empty(0, dtype=np.intp)]),
+            list(terms),
+            list(courses),
+        )
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __repr__(self) -> str:
+        return f"GradeFrame({len(self)} grades, {len(self.terms)} terms, {len(self.courses)} courses)"
+
+    def filter(self, mask: "np.ndarray") -> "GradeFrame":
+        """
+        Select grades.
+
+        :param mask: A boolean array, true for the grades to keep.
+        :return: A frame with the selected grades.
+        """
+        return GradeFrame(
+            self.value[mask],
+            self.weight[mask],
+            self.passes[mask],
+            self.counts_into_average[mask],
+            self.term_codes[mask],
+            self.course_codes[mask],
+            self.terms,
+            self.courses,
+        )
+
+    def for_terms(self, term_ids: Iterable[str]) -> "GradeFrame":
+        """
+        Select grades from some terms.
+
+        :param term_ids: The IDs of the terms.
+        :return: A frame with grades from the terms.
+        """
+        term_ids = set(term_ids)
+        selected = np.array(
+            [term_id in term_ids for term_id in self.terms], dtype=np.bool_
+        )
+        return self.filter(selected[self.term_codes])
+
+    def _average_weights(self, weighted: bool) -> "np.ndarray":
+        """
+        Get the weight of every grade in averages.
+
+        :param weighted: Whether to use the weights of grades, or count every grade once.
+        :return: The weights, zero for grades which do not count into averages or have no value (or no weight if weighted).
+        """
+        counts = self.counts_into_average & ~np.isnan(self.value)
+        if weighted:
+            counts &= ~np.isnan(self.weight)
+            return np.where(counts, self.weight, 0.0)
+        return counts.astype(np.float64)
+
+    def mean(self, weighted: bool = True) -> float:
+        """
+        Get the average of grades which count into averages.
+
+        :param weighted: Whether to weight grades, e.g. by ECTS points. Grades without a weight are then skipped.
+        :return: The average, NaN if no grade counts.
+        """
+        weights = self._average_weights(weighted)
+        total = weights.sum()
+        if not total:
+            return math.nan
+        values = np.where(weights != 0, self.value, 0.0)
+        return float(np.dot(values, weights) / total)
+
+    def gpa_by_term(self, weighted: bool = True) -> dict[str | None, float]:
+        """
+        Get the average of grades which count into averages in every term.
+
+        :param weighted: Whether to weight grades, e.g. by ECTS points. Grades without a weight are then skipped.
+        :return: The averages keyed by term ID. Terms with no grades counting are skipped.
+        """
+        weights = self._average_weights(weighted)
+        values = np.where(weights != 0, self.value, 0.0)
+        sums = np.bincount(
+            self.term_codes, weights=values * weights, minlength=len(self.terms)
+        )
+        totals = np.bincount(
+            self.term_codes, weights=weights, minlength=len(self.terms)
+        )
+        return {
+            term_id: float(term_sum / total)
+            for term_id, term_sum, total in zip(self.terms, sums, totals)
+            if total
+        }
+
+    def pass_rate(self) -> float:
+        """
+        Get the fraction of passing grades.
+
+        :return: The fraction, NaN if there are no grades.
+        """
+        if not len(self):
+            return math.nan
+        return float(self.passes.mean())
+
+    def pass_rate_by_term(self) -> dict[str | None, float]:
+        """
+        Get the fraction of passing grades in every term.
+
+        :return: The fractions keyed by term ID. Terms with no grades are skipped.
+        """
+        passed = np.bincount(
+            self.term_codes, weights=self.passes, minlength=len(self.terms)
+        )
+        totals = np.bincount(self.term_codes, minlength=len(self.terms))
+        return {
+            term_id: float(term_passed / total)
+            for term_id, term_passed, total in zip(self.terms, passed, totals)
+            if total
+        }
+
+    def distribution(self) -> dict[float, int]:
+        """
+        Count grades with every value.
+
+        :return: The numbers of grades keyed by value, in ascending order. Grades without a value are skipped.
+        """
+        values, counts = np.unique(
+            self.value[~np.isnan(self.value)], return_counts=True
+        )
+        return {float(value): int(count) for value, count in zip(values, counts)}
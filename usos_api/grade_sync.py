@@ -0,0 +1,223 @@
+from dataclasses import dataclass, field
+from typing import Hashable, Sequence
+
+from pydantic import TypeAdapter
+
+from . import json_backend
+from .models import Grade
+from .services.grades import GradeService, _CourseGrades
+from .utils import content_hash
+
+SYNC_FIELDS = [
+    "value_symbol",
+    "passes",
+    "value_description",
+    "exam_id",
+    "exam_session_number",
+    "counts_into_average",
+    "date_modified",
+]
+
+_course_grades_adapter = TypeAdapter(_CourseGrades)
+
+
+@dataclass
+class GradeEvent:
+    """
+    A grade which was added or changed since the previous sync.
+
+    :ivar str kind: ``"added"`` or ``"changed"``.
+    :ivar str term_id: The ID of the term.
+    :ivar str course_id: The ID of the course.
+    :ivar str | None unit_id: The ID of the course unit, None for a final course grade.
+    :ivar Grade grade: The grade.
+    """
+
+    kind: str
+    term_id: str
+    course_id: str
+    unit_id: str | None
+    grade: Grade
+
+
+@dataclass
+class _UserSnapshot:
+    """
+    What was seen in the previous sync of a user.
+
+    :ivar dict bodies: Hashes of raw responses, keyed by the term IDs of the request.
+    :ivar dict courses: Hashes of courses and the versions of their grades, keyed by term ID and course ID.
+    """
+
+    bodies: dict[str, bytes] = field(default_factory=dict)
+    courses: dict[tuple[str, str], tuple[bytes, dict[tuple, tuple]]] = field(
+        default_factory=dict
+    )
+
+
+class GradeSync:
+    """
+    Polls grades and reports only grades which were added or changed since the previous poll, e.g. to send notifications.
+
+    A snapshot is kept for every user. A response identical to the previous one is not decoded at all,
+    and in a changed response only courses whose content changed are deserialized. Grades are matched by their
+    course unit, ``exam_id`` and ``exam_session_number``, and are changed if their ``date_modified`` or value changed.
+    Removed grades are forgotten without an event.
+    """
+
+    def __init__(
+        self,
+        grade_service: GradeService,
+        fields: list[str] | None = None,
+        emit_initial: bool = False,
+    ):
+        """
+        Initialize the sync.
+
+        :param grade_service: The service to fetch grades with.
+        :param fields: The fields of grades to fetch. They always include the fields grades are matched by. If not given, :data:`SYNC_FIELDS` is used.
+        :param emit_initial: Whether the first sync of a user reports all their grades as added. If false, it only takes the snapshot.
+        """
+        self.grade_service = grade_service
+        fields = list(
+            dict.fromkeys(
+                [
+                    *(fields or SYNC_FIELDS),
+                    "exam_id",
+                    "exam_session_number",
+                    "date_modified",
+                ]
+            )
+        )
+        self.fields = "|".join(fields)
+        self.emit_initial = emit_initial
+        self._snapshots: dict[Hashable, _UserSnapshot] = {}
+
+    async def sync(
+        self, term_ids: list[str] | str, user_key: Hashable | None = None
+    ) -> list[GradeEvent]:
+        """
+        Fetch grades of terms and report the ones added or changed since the previous sync.
+
+        :param term_ids: The IDs of the terms to sync, or a single term ID.
+        :param user_key: The key of the user's snapshot. If not given, the access token requests are signed with is used, so users served with :class:`UserContext` are kept apart.
+        :return: The added and changed grades.
+        """
+        term_ids = [term_ids] if isinstance(term_ids, str) else term_ids
+        if user_key is None:
+            user_key = self.grade_service.connection.auth_manager.get_token_identity()
+        responses = await self.grade_service.get_raw_grades_by_terms(
+            term_ids, self.fields
+        )
+        return self.apply_responses(user_key, responses)
+
+    def apply_responses(
+        self, user_key: Hashable, responses: Sequence[tuple[Sequence[str], bytes]]
+    ) -> list[GradeEvent]:
+        """
+        Compare raw ``services/grades/terms2`` responses with the snapshot of a user and update it.
+
+        :param user_key: The key of the user's snapshot.
+        :param responses: The IDs of the terms in every request with its raw response body.
+        :return: The added and changed grades.
+        """
+        snapshot = self._snapshots.get(user_key)
+        emit = snapshot is not None or self.emit_initial
+        # Work on copies, so a response which fails to validate leaves the snapshot as it was
+        bodies = dict(snapshot.bodies) if snapshot is not None else {}
+        courses = dict(snapshot.courses) if snapshot is not None else {}
+
+        events = []
+        for term_ids, body in responses:
+            request_key = "|".join(term_ids)
+            body_hash = content_hash(body)
+            if bodies.get(request_key) == body_hash:
+                continue
+
+            response = json_backend.loads(body)
+            seen = set()
+            for term_id, term_courses in response.items():
+                for course_id, course in term_courses.items():
+                    seen.add((term_id, course_id))
+                    self._apply_course(
+                        courses, term_id, course_id, course, events if emit else None
+                    )
+            requested = set(term_ids)
+            for key in [
+                key for key in courses if key[0] in requested and key not in seen
+            ]:
+                del courses[key]
+            bodies[request_key] = body_hash
+
+        self._snapshots[user_key] = _UserSnapshot(bodies, courses)
+        return events
+
+    def _apply_course(
+        self,
+        courses: dict[tuple[str, str], tuple[bytes, dict[tuple, tuple]]],
+        term_id: str,
+        course_id: str,
+        course: dict,
+        events: list[GradeEvent] | None,
+    ) -> None:
+        """
+        Compare the grades of a course with the snapshot and update it.
+
+        :param courses: The courses of the user's snapshot, updated in place.
+        :param term_id: The ID of the term.
+        :param course_id: The ID of the course.
+        :param course: The raw grades of the course.
+        :param events: The list to add events to, None to only update the snapshot.
+        """
+        course_hash = content_hash(json_backend.dumps(course))
+        previous = courses.get((term_id, course_id))
+        if previous is not None and previous[0] == course_hash:
+            return
+        previous_versions = previous[1] if previous is not None else {}
+
+        grades = _course_grades_adapter.validate_python(course)
+        versions = {}
+        for unit_id, grade in self._iter_grades(grades):
+            key = (unit_id, grade.exam_id, grade.exam_session_number)
+            version = (grade.date_modified, grade.value_symbol)
+            versions[key] = version
+            if events is None:
+                continue
+            previous_version = previous_versions.get(key)
+            if previous_version is None:
+                events.append(GradeEvent("added", term_id, course_id, unit_id, grade))
+            elif previous_version != version:
+                events.append(GradeEvent("changed", term_id, course_id, unit_id, grade))
+        courses[(term_id, course_id)] = (course_hash, versions)
+
+    @staticmethod
+    def _iter_grades(grades: _CourseGrades):
+        """
+        Iterate over all grades of a course.
+
+        :param grades: The grades of the course.
+        :return: Pairs of the course unit ID (None for final course grades) and the grade.
+        """
+        for session in grades.course_grades:
+            for grade in session.values():
+                if grade is not None:
+                    yield None, grade
+        for unit_id, sessions in grades.course_units_grades.items():
+            for session in sessions:
+                for grade in session.values():
+                    if grade is not None:
+                        yield unit_id, grade
+
+    def forget(self, user_key: Hashable) -> None:
+        """
+        Forget the snapshot of a user, so their next sync only takes a new snapshot (unless ``emit_initial`` is set).
+
+        :param user_key: The key of the user's snapshot.
+        """
+        self._snapshots.pop(user_key, None)
+
+    def clear(self) -> None:
+        """
+        Forget the snapshots of all users.
+        """
+        self._snapshots.clear()
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING, List
 
+from usos_api.grade_frame import GradeFrame
 from usos_api.models import CourseEdition, Grade
+from usos_api.utils import TaskGraph
 
 if TYPE_CHECKING:
     from usos_api import USOSClient
@@ -19,14 +21,41 @@ class APIHelper:
         :param current_term_only: If True, only consider the current term.
         :return: A list of user end grades with weights.
         """
-        ects_by_term = await self.client.course_service.get_user_courses_ects()
-        terms = await self.client.term_service.get_terms(list(ects_by_term.keys()))
+        graph = TaskGraph()
+        graph.add("ects", self.client.course_service.get_user_courses_ects)
+        graph.add(
+            "terms",
+            lambda ects_by_term: self.client.term_service.get_terms(list(ects_by_term)),
+            "ects",
+        )
+        if current_term_only:
+            # Only grades of ongoing terms are needed, so wait for the terms
+            graph.add(
+                "grades",
+                lambda terms: self.client.grade_service.get_grades_by_terms(
+                    [term.id for term in terms if term.is_ongoing]
+                ),
+                "terms",
+            )
+        else:
+            # Fetch grades of all terms at the same time as the terms themselves
+            graph.add(
+                "grades",
+                lambda ects_by_term: self.client.grade_service.get_grades_by_terms(
+                    list(ects_by_term)
+                ),
+                "ects",
+            )
+        results = await graph.run()
+        ects_by_term, terms, grades_by_term = (
+            results["ects"],
+            results["terms"],
+            results["grades"],
+        )
         term_ids = [
             term.id for term in terms if not current_term_only or term.is_ongoing
         ]
 
-        grades_by_term = await self.client.grade_service.get_grades_by_terms(term_ids)
-
         user_grades = []
         for term in terms:
             if term.id not in term_ids:
@@ -43,3 +72,16 @@ class APIHelper:
                     user_grades.append(grade)
 
         return user_grades
+
+    async def get_user_grade_frame(self, current_term_only: bool = False) -> GradeFrame:
+        """
+        Get user end grades with weights as a :class:`GradeFrame`, for computing averages.
+
+        Requires NumPy, install it with the ``numpy`` extra.
+
+        :param current_term_only: If True, only consider the current term.
+        :return: The grades, weighted by ECTS points.
+        """
+        return GradeFrame.from_grades(
+            await self.get_user_end_grades_with_weights(current_term_only)
+        )
@@ -0,0 +1,102 @@
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+class JSONBackend:
+    """
+    Decodes and encodes untyped JSON, based on the standard library ``json`` module.
+
+    Responses decoded into models are validated straight from bytes by pydantic and do not use the backend.
+    """
+
+    name = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decode JSON.
+
+        :param data: The JSON document.
+        :return: The decoded data.
+        """
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encode data as JSON.
+
+        :param obj: The data to encode.
+        :return: The UTF-8 encoded JSON document.
+        """
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class OrjsonBackend(JSONBackend):
+    """
+    Decodes and encodes untyped JSON with ``orjson``, install it with the ``orjson`` extra.
+    """
+
+    name = "orjson"
+
+    def __init__(self):
+        """
+        Initialize the backend.
+
+        :raises ImportError: If ``orjson`` is not installed.
+        """
+        if orjson is None:
+            raise ImportError(
+                "orjson is not installed, install usos-api[orjson] to use it."
+            )
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+_backend: JSONBackend = OrjsonBackend() if orjson is not None else JSONBackend()
+
+
+def get_json_backend() -> JSONBackend:
+    """
+    Get the JSON backend used for untyped responses.
+
+    :return: The JSON backend, ``orjson`` if it is installed, the standard library otherwise.
+    """
+    return _backend
+
+
+def set_json_backend(backend: JSONBackend) -> None:
+    """
+    Set the JSON backend used for untyped responses.
+
+    :param backend: The JSON backend, e.g. ``JSONBackend()`` to use the standard library even if ``orjson`` is installed.
+    """
+    global _backend
+    _backend = backend
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode JSON with the current backend.
+
+    :param data: The JSON document.
+    :return: The decoded data.
+    """
+    return _backend.loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Encode data as JSON with the current backend.
+
+    :param obj: The data to encode.
+    :return: The UTF-8 encoded JSON document.
+    """
+    return _backend.dumps(obj)
@@ -0,0 +1,108 @@
+import asyncio
+import contextvars
+from typing import Awaitable, Callable, Generic, Hashable, Iterable, TypeVar
+
+from .utils import chunked
+
+_K = TypeVar("_K", bound=Hashable)
+_V = TypeVar("_V")
+
+
+class _Batch:
+    """
+    Keys waiting to be loaded together, with the context of the first caller.
+    """
+
+    def __init__(self, context: contextvars.Context):
+        self.context = context
+        self.futures: dict = {}
+
+
+class BatchLoader(Generic[_K, _V]):
+    """
+    Collects single lookups made in the same event loop iteration and loads them with one call to a plural endpoint.
+
+    Lookups made on behalf of different users (see :class:`UserContext`) are never mixed in one batch.
+    Keys requested more than once in the same batch are loaded once.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[list[_K]], Awaitable[dict[_K, _V]]],
+        max_batch_size: int = 50,
+        identity_fn: Callable[[], Hashable] | None = None,
+    ):
+        """
+        Initialize the loader.
+
+        :param batch_fn: The coroutine function loading a list of keys, returning the values keyed by the keys. Missing keys resolve to None.
+        :param max_batch_size: The maximum number of keys loaded in a single call, larger batches are split.
+        :param identity_fn: A function returning the identity of the current caller (e.g. their access token). Lookups are batched per identity.
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max_batch_size
+        self.identity_fn = identity_fn
+        self._batches: dict[Hashable, _Batch] = {}
+        self._loading: set[asyncio.Task] = set()
+
+    async def load(self, key: _K) -> _V | None:
+        """
+        Load a single value, batched with other lookups made in the same iteration.
+
+        :param key: The key to load.
+        :return: The value, or None if it was not found.
+        """
+        identity = self.identity_fn() if self.identity_fn is not None else None
+        batch = self._batches.get(identity)
+        if batch is None:
+            batch = self._batches[identity] = _Batch(contextvars.copy_context())
+            asyncio.get_running_loop().call_soon(self._dispatch, identity)
+        future = batch.futures.get(key)
+        if future is None:
+            future = batch.futures[key] = asyncio.get_running_loop().create_future()
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: Iterable[_K]) -> list[_V | None]:
+        """
+        Load many values, batched with other lookups made in the same iteration.
+
+        :param keys: The keys to load.
+        :return: The values in the order of the keys, None for keys that were not found.
+        """
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def _dispatch(self, identity: Hashable) -> None:
+        """
+        Start loading a collected batch.
+
+        :param identity: The identity of the callers in the batch.
+        """
+        batch = self._batches.pop(identity)
+        for keys in chunked(list(batch.futures), self.max_batch_size):
+            futures = {key: batch.futures[key] for key in keys}
+            # The task copies the context, so the batch is sent on behalf of its callers
+            task = batch.context.run(asyncio.ensure_future, self._load_batch(futures))
+            # The event loop keeps only weak references to tasks
+            self._loading.add(task)
+            task.add_done_callback(self._loading.discard)
+
+    async def _load_batch(self, futures: dict) -> None:
+        """
+        Load a batch and resolve the futures of its callers.
+
+        :param futures: The futures of the callers, keyed by key.
+        """
+        try:
+            values = await self.batch_fn(list(futures))
+        except asyncio.CancelledError:
+            for future in futures.values():
+                future.cancel()
+            raise
+        except Exception as e:
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in futures.items():
+            if not future.done():
+                future.set_result(values.get(key))
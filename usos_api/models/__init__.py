@@ -19,6 +19,7 @@ from .course import (
 from .grade import Grade
 from .group import Group
 from .lang_dict import LangDict
+from .lazy import LazyModel
 from .programme import Programme, StudentProgramme
 from .registration import (
     CoursesCart,
@@ -89,4 +90,5 @@ __all__ = [
     "Stage",
     "Link",
     "CoursesCart",
+    "LazyModel",
 ]
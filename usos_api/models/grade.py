@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Any, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, model_validator
 
 from . import CourseEdition
 from .course import CourseUnit
@@ -34,10 +34,12 @@ class Grade(BaseModel):
         None  # Not returned by USOS API but is here to make it easier to work with grades
     )
 
-    def __init__(self, **data: Any):
-        super().__init__(**data)
+    @model_validator(mode="after")
+    def _parse_value_symbol(self) -> "Grade":
+        # Runs on every validation, including validation straight from JSON, unlike __init__
         if self.value_symbol:
             try:
                 self.value = float(self.value_symbol.replace(",", "."))
             except ValueError:
                 pass  # Invalid value, ignore it
+        return self
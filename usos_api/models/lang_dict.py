@@ -1,10 +1,14 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class LangDict(BaseModel):
     """
     Class representing a dictionary with translations.
+
+    It is immutable, so identical translations can be shared between models (see :class:`usos_api.intern.InternPool`).
     """
 
+    model_config = ConfigDict(frozen=True)
+
     pl: str | None = None
     en: str | None = None
@@ -0,0 +1,82 @@
+from functools import lru_cache
+from typing import Annotated, Any, Generic, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+_M = TypeVar("_M", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def _get_field_adapter(model: type[BaseModel], name: str) -> TypeAdapter:
+    """
+    Get a type adapter validating a single field of a model.
+
+    :param model: The model.
+    :param name: The name of the field.
+    :return: The type adapter.
+    """
+    field = model.model_fields[name]
+    if field.metadata:
+        return TypeAdapter(Annotated[(field.annotation, *field.metadata)])
+    return TypeAdapter(field.annotation)
+
+
+class LazyModel(Generic[_M]):
+    """
+    A read-only view of a model over raw response data, validating fields only when they are read.
+
+    Each field is validated on first access, together with the sub-objects it contains, and memoised, so fields
+    which are never read cost nothing but their raw data. Use :meth:`to_model` to validate the whole model.
+    Model validators of the model itself only run on full validation.
+    """
+
+    def __init__(self, model: type[_M], data: dict[str, Any]):
+        """
+        Initialize the view.
+
+        :param model: The model the data is validated into.
+        :param data: The raw data of the model, as decoded from JSON.
+        """
+        object.__setattr__(self, "_model", model)
+        object.__setattr__(self, "_data", data)
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)  # Not set yet, e.g. while copying
+        field = self._model.model_fields.get(name)
+        if field is None:
+            raise AttributeError(
+                f"{self._model.__name__!r} object has no attribute {name!r}"
+            )
+        if name in self._data:
+            value = _get_field_adapter(self._model, name).validate_python(
+                self._data[name]
+            )
+        else:
+            value = field.get_default(call_default_factory=True)
+        self.__dict__[name] = value
+        return value
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is read-only")
+
+    def __dir__(self) -> list[str]:
+        return sorted({*super().__dir__(), *self._model.model_fields})
+
+    def __repr__(self) -> str:
+        return f"LazyModel[{self._model.__name__}]({self._data!r})"
+
+    @property
+    def raw_data(self) -> dict[str, Any]:
+        """
+        The raw data of the model.
+        """
+        return self._data
+
+    def to_model(self) -> _M:
+        """
+        Validate the whole model.
+
+        :return: The validated model.
+        """
+        return self._model.model_validate(self._data)
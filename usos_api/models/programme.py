@@ -1,6 +1,6 @@
 from datetime import date
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class Programme(BaseModel):
@@ -30,5 +30,5 @@ class StudentProgramme(BaseModel):
     programme: Programme | None = None
     status: str | None = None
     admission_date: date | None = None
-    stages: list = []
+    stages: list = Field(default_factory=list)
     is_primary: bool | None = None
@@ -1,7 +1,7 @@
 from datetime import date
 from enum import Enum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 from .course import CourseEditionConducted
 from .lang_dict import LangDict
@@ -124,7 +124,7 @@ class User(BaseModel):
     first_name: str | None = None
     middle_names: str | None = None
     last_name: str | None = None
-    previous_names: list[PreviousName] = []
+    previous_names: list[PreviousName] = Field(default_factory=list)
     sex: Sex | None = None
     titles: Title | None = None
     student_status: StudentStatus | None = None
@@ -135,23 +135,25 @@ class User(BaseModel):
     has_email: bool | None = None
     homepage_url: str | None = None
     profile_url: str | None = None
-    phone_numbers: list[str] = []
-    mobile_numbers: list[str] = []
+    phone_numbers: list[str] = Field(default_factory=list)
+    mobile_numbers: list[str] = Field(default_factory=list)
     office_hours: LangDict | None = None
     interests: LangDict | None = None
     has_photo: bool | None = None
-    photo_urls: dict[str, str] = {}
+    photo_urls: dict[str, str] = Field(default_factory=dict)
     student_number: str | None = None
     pesel: str | None = None
     birth_date: date | None = None
     revenue_office_id: str | None = None
     citizenship: str | None = None
     room: str | None = None
-    student_programmes: list[StudentProgramme] = []
-    employment_functions: list[EmploymentFunction] = []
-    employment_positions: list[EmploymentPosition] = []
-    course_editions_conducted: list[CourseEditionConducted] = []
-    postal_addresses: list[PostalAddress] = []
+    student_programmes: list[StudentProgramme] = Field(default_factory=list)
+    employment_functions: list[EmploymentFunction] = Field(default_factory=list)
+    employment_positions: list[EmploymentPosition] = Field(default_factory=list)
+    course_editions_conducted: list[CourseEditionConducted] = Field(
+        default_factory=list
+    )
+    postal_addresses: list[PostalAddress] = Field(default_factory=list)
     alt_email: str | None = None
     can_i_debug: bool = False
     external_ids: ExternalIds | None = None
@@ -0,0 +1,162 @@
+from dataclasses import dataclass
+
+import aiohttp
+
+from .exceptions import USOSAPIException
+from .logger import get_logger
+
+_LOGGER = get_logger("ConnectionPool")
+
+
+@dataclass
+class PoolStats:
+    """
+    Snapshot of the connection pool usage.
+
+    :ivar int open: Number of open connections (idle + acquired).
+    :ivar int idle: Number of keep-alive connections waiting to be reused.
+    :ivar int acquired: Number of connections currently used by requests.
+    :ivar int limit: Maximum number of connections in the pool (0 means unlimited).
+    :ivar int limit_per_host: Maximum number of connections per host (0 means unlimited).
+    """
+
+    open: int
+    idle: int
+    acquired: int
+    limit: int
+    limit_per_host: int
+
+
+class ConnectionPool:
+    """
+    A pooled HTTP transport shared by :class:`USOSAPIConnection` and :class:`AuthManager`.
+
+    A single pool may be shared by many clients, it is opened on first use and closed when the last user closes it.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30.0,
+        use_dns_cache: bool = True,
+        ttl_dns_cache: int | None = 300,
+        total_timeout: float | None = 60.0,
+        connect_timeout: float | None = 10.0,
+        read_timeout: float | None = None,
+        trust_env: bool = False,
+    ):
+        """
+        Initialize the connection pool.
+
+        :param limit: Maximum number of simultaneous connections, 0 for no limit.
+        :param limit_per_host: Maximum number of simultaneous connections to a single host, 0 for no limit.
+        :param keepalive_timeout: How long (in seconds) an idle connection is kept open for reuse.
+        :param use_dns_cache: Whether to cache DNS lookups.
+        :param ttl_dns_cache: How long (in seconds) DNS lookups are cached, None to cache forever.
+        :param total_timeout: Timeout (in seconds) for the whole request, None to disable.
+        :param connect_timeout: Timeout (in seconds) for acquiring a connection, including the TCP/TLS handshake, None to disable.
+        :param read_timeout: Timeout (in seconds) for reading a portion of the response, None to disable.
+        :param trust_env: Whether to trust the environment variables for the connection, see https://docs.aiohttp.org/en/stable/client_reference.html#aiohttp.ClientSession for more information.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.use_dns_cache = use_dns_cache
+        self.ttl_dns_cache = ttl_dns_cache
+        self.timeout = aiohttp.ClientTimeout(
+            total=total_timeout, connect=connect_timeout, sock_read=read_timeout
+        )
+        self.trust_env = trust_env
+        self._connector = None
+        self._session = None
+        self._users = 0
+
+    async def __aenter__(self) -> "ConnectionPool":
+        """
+        Enter the pool.
+
+        :return: The pool.
+        """
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Exit the pool.
+
+        :param exc_type: The exception type.
+        :param exc_value: The exception value.
+        :param traceback: The traceback.
+        """
+        await self.close()
+
+    @property
+    def is_open(self) -> bool:
+        """
+        Whether the pool is open.
+        """
+        return self._session is not None and not self._session.closed
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """
+        The underlying session.
+
+        :raises USOSAPIException: If the pool is not open.
+        """
+        if not self.is_open:
+            raise USOSAPIException(
+                "Connection pool is not open. Did you forget to open the client?"
+            )
+        return self._session
+
+    async def open(self):
+        """
+        Open the pool, or register another user of an already open pool.
+        """
+        self._users += 1
+        if self.is_open:
+            return
+        self._connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=self.use_dns_cache,
+            ttl_dns_cache=self.ttl_dns_cache,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=self._connector, timeout=self.timeout, trust_env=self.trust_env
+        )
+        _LOGGER.debug("Connection pool opened")
+
+    async def close(self):
+        """
+        Unregister a user of the pool, closing it when no users are left.
+        """
+        if self._users > 0:
+            self._users -= 1
+        if self._users == 0 and self._session:
+            await self._session.close()
+            self._session = None
+            self._connector = None
+            _LOGGER.debug("Connection pool closed")
+
+    def get_stats(self) -> PoolStats:
+        """
+        Get the current usage of the pool.
+
+        :return: The pool statistics.
+        """
+        idle = acquired = 0
+        if self._connector is not None and not self._connector.closed:
+            # aiohttp does not expose these counters publicly
+            idle = sum(len(conns) for conns in self._connector._conns.values())
+            acquired = len(self._connector._acquired)
+        return PoolStats(
+            open=idle + acquired,
+            idle=idle,
+            acquired=acquired,
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+        )
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .clock import ServerClock
+from .endpoint import Endpoint
+from .logger import get_logger
+
+_LOGGER = get_logger("PreparedRegistration")
+
+# How long before the deadline to stop sleeping and start polling the clock
+_SPIN_TIME = 0.02
+
+
+@dataclass
+class RegistrationTiming:
+    """
+    Timing of a registration request fired by :class:`PreparedRegistration`.
+
+    :ivar datetime target: The server time the request was meant to be sent at.
+    :ivar datetime sent_at: The estimated server time the request was sent at.
+    :ivar float fire_delay: How late (in seconds) the request was sent, by the local clock.
+    :ivar float latency: How long (in seconds) the request took, from sending it to receiving the response.
+    :ivar float clock_error: The maximum error (in seconds) of the server clock estimate.
+    :ivar int warm_connections: Number of idle keep-alive connections in the pool just before sending.
+    """
+
+    target: datetime
+    sent_at: datetime
+    fire_delay: float
+    latency: float
+    clock_error: float
+    warm_connections: int
+
+
+class PreparedRegistration:
+    """
+    A registration to a course prepared in advance, to be sent the moment a registration round opens.
+
+    Before the round opens, the server clock is measured with ``services/apisrv/now`` and a few connections to the
+    installation are opened and kept warm, so the request does not wait for a TCP/TLS handshake.
+    The request is sent at the round start on the server's clock and its timing is recorded.
+    """
+
+    def __init__(
+        self,
+        connection,
+        endpoint: Endpoint,
+        connections: int = 2,
+        keepalive_interval: float = 2.0,
+        clock_samples: int = 5,
+    ):
+        """
+        Initialize the prepared registration. Use :meth:`RegistrationService.prepare_registration` to create it.
+
+        :param connection: The connection to use.
+        :param endpoint: The endpoint of ``services/registrations/register`` with the registration parameters.
+        :param connections: The number of connections kept warm.
+        :param keepalive_interval: How often (in seconds) warm connections are used, so the server does not close them.
+        :param clock_samples: The number of readings of the server clock taken when warming up.
+        """
+        self.connection = connection
+        self.endpoint = endpoint
+        self.connections = connections
+        self.keepalive_interval = keepalive_interval
+        self.clock_samples = clock_samples
+        self.clock = ServerClock(connection)
+        self.timing: RegistrationTiming | None = None
+
+    async def warm_up(self) -> None:
+        """
+        Measure the server clock and open the warm connections.
+        """
+        await self.clock.sync(self.clock_samples)
+        await self._keep_warm()
+        _LOGGER.debug(f"Warmed up, server clock error {self.clock.error * 1e3:.1f} ms")
+
+    async def _keep_warm(self) -> None:
+        """
+        Use the warm connections concurrently, which also refreshes the server clock.
+        """
+        await asyncio.gather(*(self.clock.sample() for _ in range(self.connections)))
+
+    async def register_at(self, start: datetime, lead: float = 0.0) -> Any:
+        """
+        Wait until the given server time, keeping connections warm, and send the registration request.
+
+        The timing of the request is stored in :attr:`timing`, also if the request fails.
+
+        :param start: The server time to send the request at, e.g. ``RegistrationRound.start_date``.
+        :param lead: Send the request this many seconds early, e.g. half of the round trip, so it reaches the server when the round opens.
+        :return: The response of ``services/registrations/register``.
+        """
+        if self.clock.reference is None:
+            await self.warm_up()
+        while (
+            self.clock.to_monotonic(start) - lead - time.monotonic()
+            > self.keepalive_interval * 2
+        ):
+            await asyncio.sleep(self.keepalive_interval)
+            await self._keep_warm()
+
+        deadline = self.clock.to_monotonic(start) - lead
+        await asyncio.sleep(max(deadline - time.monotonic() - _SPIN_TIME, 0))
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0)
+
+        warm_connections = self.connection.pool.get_stats().idle
+        sent = time.monotonic()
+        sent_at = self.clock.now()
+        try:
+            return await self.endpoint.post()
+        finally:
+            self.timing = RegistrationTiming(
+                start,
+                sent_at,
+                sent - deadline,
+                time.monotonic() - sent,
+                self.clock.error,
+                warm_connections,
+            )
+            _LOGGER.info(
+                f"Registration sent {self.timing.fire_delay * 1e3:.1f} ms late, took {self.timing.latency * 1e3:.1f} ms"
+            )
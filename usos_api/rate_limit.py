@@ -0,0 +1,199 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator
+
+from .logger import get_logger
+from .utils import match_service_rule
+
+_LOGGER = get_logger("RateLimiter")
+
+
+@dataclass
+class RateLimit:
+    """
+    A limit of request rate and concurrency.
+
+    :ivar float | None rate: Number of requests allowed per second, None for no rate limit.
+    :ivar int burst: Number of requests that may be sent at once before the rate limit kicks in.
+    :ivar int | None max_in_flight: Maximum number of requests waiting for a response at the same time, None for no limit.
+    """
+
+    rate: float | None = None
+    burst: int = 1
+    max_in_flight: int | None = None
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Snapshot of the rate limiter usage.
+
+    :ivar int queued: Number of requests currently waiting for the limiter.
+    :ivar int in_flight: Number of requests currently let through by the limiter.
+    :ivar int total_requests: Number of requests that passed through the limiter.
+    :ivar float total_wait_time: Total time (in seconds) requests spent waiting.
+    :ivar float max_wait_time: The longest time (in seconds) a single request waited.
+    """
+
+    queued: int = 0
+    in_flight: int = 0
+    total_requests: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+
+    @property
+    def average_wait_time(self) -> float:
+        """
+        Average time (in seconds) a request waited.
+        """
+        if not self.total_requests:
+            return 0.0
+        return self.total_wait_time / self.total_requests
+
+
+class _TokenBucket:
+    """
+    A token bucket serving waiters in FIFO order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            while self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+class _Limit:
+    """
+    Runtime state of a single :class:`RateLimit`.
+    """
+
+    def __init__(self, limit: RateLimit):
+        self.bucket = (
+            _TokenBucket(limit.rate, limit.burst) if limit.rate is not None else None
+        )
+        self.semaphore = (
+            asyncio.Semaphore(limit.max_in_flight)
+            if limit.max_in_flight is not None
+            else None
+        )
+
+
+class RateLimiter:
+    """
+    A client-side token bucket rate limiter with a cap on requests in flight.
+
+    Limits are applied per consumer key, and optionally per service path pattern on top of that.
+    The same limiter can be shared by many connections using the same consumer key.
+    """
+
+    def __init__(
+        self,
+        default: RateLimit | None = None,
+        consumers: dict[str, RateLimit] | None = None,
+        services: dict[str, RateLimit] | None = None,
+    ):
+        """
+        Initialize the rate limiter.
+
+        :param default: The limit for all requests of a consumer, unless overridden in `consumers`.
+        :param consumers: Limits for all requests of specific consumers, keyed by consumer key.
+        :param services: Additional limits for service paths, keyed by patterns like ``services/grades/*``. Only the first matching pattern is applied, separately for each consumer.
+        """
+        self.default = default
+        self.consumers = consumers or {}
+        self.services = services or {}
+        self._limits: dict[tuple[str, str | None], _Limit] = {}
+        self._stats = RateLimiterStats()
+
+    def _get_limits(self, consumer_key: str, service: str) -> list[_Limit]:
+        limits = []
+        consumer_limit = self.consumers.get(consumer_key, self.default)
+        if consumer_limit is not None:
+            limits.append(self._get_limit((consumer_key, None), consumer_limit))
+        rule = match_service_rule(self.services, service)
+        if rule is not None:
+            pattern, service_limit = rule
+            limits.append(self._get_limit((consumer_key, pattern), service_limit))
+        return limits
+
+    def _get_limit(self, key: tuple[str, str | None], limit: RateLimit) -> _Limit:
+        state = self._limits.get(key)
+        if state is None:
+            state = self._limits[key] = _Limit(limit)
+        return state
+
+    @asynccontextmanager
+    async def acquire(self, consumer_key: str, service: str) -> AsyncIterator[None]:
+        """
+        Wait until a request may be sent, and hold its in-flight slot inside the ``async with`` block.
+
+        :param consumer_key: The consumer key the request is made with.
+        :param service: The service path of the request.
+        """
+        limits = self._get_limits(consumer_key, service)
+        acquired = []
+        started_at = time.monotonic()
+        self._stats.queued += 1
+        try:
+            for limit in limits:
+                if limit.semaphore is not None:
+                    await limit.semaphore.acquire()
+                    acquired.append(limit.semaphore)
+            for limit in limits:
+                if limit.bucket is not None:
+                    await limit.bucket.acquire()
+        except BaseException:
+            for semaphore in acquired:
+                semaphore.release()
+            raise
+        finally:
+            self._stats.queued -= 1
+
+        waited = time.monotonic() - started_at
+        self._stats.total_requests += 1
+        self._stats.total_wait_time += waited
+        self._stats.max_wait_time = max(self._stats.max_wait_time, waited)
+        if waited > 1:
+            _LOGGER.debug(f"Request to {service} waited {waited:.2f}s for rate limit")
+        self._stats.in_flight += 1
+        try:
+            yield
+        finally:
+            self._stats.in_flight -= 1
+            for semaphore in acquired:
+                semaphore.release()
+
+    def get_stats(self) -> RateLimiterStats:
+        """
+        Get the current usage of the limiter.
+
+        :return: A copy of the limiter statistics.
+        """
+        return RateLimiterStats(**vars(self._stats))
+
+    def reset_stats(self) -> None:
+        """
+        Reset the wait time and request counters.
+        """
+        self._stats.total_requests = 0
+        self._stats.total_wait_time = 0.0
+        self._stats.max_wait_time = 0.0
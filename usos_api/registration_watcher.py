@@ -0,0 +1,243 @@
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator
+
+from pydantic import TypeAdapter
+
+from . import json_backend
+from .clock import ServerClock
+from .models import CoursesCart, Registration, RegistrationRound
+from .services.registrations import RegistrationService
+from .utils import content_hash
+
+CART_FIELDS = [
+    "course",
+    "term",
+    "user_registration_status",
+    "is_registration_valid",
+    "choice_number",
+    "limits",
+    "registrations_count",
+    "registration_status",
+    "active_registration_round_id",
+]
+REGISTRATION_FIELDS = [
+    "id",
+    "description",
+    "status",
+    "rounds[id|name|status|start_date|end_date]",
+]
+
+# The interval is this fraction of the time to the nearest round start or end
+_APPROACH_FACTOR = 0.05
+
+_cart_entry_adapter = TypeAdapter(CoursesCart)
+_registrations_adapter = TypeAdapter(list[Registration])
+
+
+@dataclass
+class CartChange:
+    """
+    A courses cart entry which was added, changed or removed since the previous poll.
+
+    :ivar str kind: ``"added"``, ``"changed"`` or ``"removed"``.
+    :ivar tuple key: The course ID and the term ID of the entry.
+    :ivar CoursesCart | None entry: The entry, None if it was removed.
+    """
+
+    kind: str
+    key: tuple
+    entry: CoursesCart | None
+
+
+@dataclass
+class RoundChange:
+    """
+    A registration round whose status changed since the previous poll, e.g. when it opened.
+
+    :ivar Registration registration: The registration the round belongs to.
+    :ivar RegistrationRound round: The round, with its new status.
+    :ivar str | None previous_status: The status in the previous poll, None if the round is new.
+    """
+
+    registration: Registration
+    round: RegistrationRound
+    previous_status: str | None
+
+
+class RegistrationWatcher:
+    """
+    Polls the courses cart and the user's registrations, and reports only changed cart entries and round status changes.
+
+    A response identical to the previous one is not decoded at all, and in a changed cart only the changed entries are
+    deserialized. Polls are more frequent near the start and the end of registration rounds: the interval is 1/20 of
+    the time to the nearest one, between ``min_interval`` and ``max_interval``, and a poll is due right when a round
+    starts or ends. Changes found in the first poll are not reported, unless ``emit_initial`` is set.
+
+    Requests are made on behalf of the user whose context is active where the watcher is iterated.
+    """
+
+    def __init__(
+        self,
+        registration_service: RegistrationService,
+        min_interval: float = 2.0,
+        max_interval: float = 60.0,
+        clock: ServerClock | None = None,
+        cart_fields: list[str] | None = None,
+        registration_fields: list[str] | None = None,
+        emit_initial: bool = False,
+    ):
+        """
+        Initialize the watcher.
+
+        :param registration_service: The service to poll with.
+        :param min_interval: The shortest time (in seconds) between polls.
+        :param max_interval: The longest time (in seconds) between polls.
+        :param clock: The server clock to compare round dates with. If not given, the local clock is used.
+        :param cart_fields: The fields of cart entries. If not given, :data:`CART_FIELDS` is used.
+        :param registration_fields: The fields of registrations, which should include the statuses and dates of rounds. If not given, :data:`REGISTRATION_FIELDS` is used.
+        :param emit_initial: Whether the first poll reports all cart entries as added and all rounds as new.
+        """
+        self.registration_service = registration_service
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.clock = clock
+        self.cart_fields = cart_fields or CART_FIELDS
+        self.registration_fields = registration_fields or REGISTRATION_FIELDS
+        self.emit_initial = emit_initial
+        self._polled = False
+        self._cart_hash: bytes | None = None
+        self._cart_entries: dict[tuple, bytes] = {}
+        self._registrations_hash: bytes | None = None
+        self._round_statuses: dict[str, str | None] = {}
+        self._round_dates: list[datetime] = []
+
+    async def watch(self) -> AsyncIterator[CartChange | RoundChange]:
+        """
+        Poll until the iteration is stopped.
+
+        :return: An async iterator of changes, as they are found.
+        """
+        while True:
+            for change in await self.poll():
+                yield change
+            await asyncio.sleep(self.get_interval())
+
+    async def poll(self) -> list[CartChange | RoundChange]:
+        """
+        Poll the courses cart and the registrations once.
+
+        :return: The changes since the previous poll.
+        """
+        service = self.registration_service
+        cart_body, registrations_body = await asyncio.gather(
+            service.get_raw_courses_cart(self.cart_fields),
+            service.get_raw_user_registrations(self.registration_fields),
+        )
+        emit = self._polled or self.emit_initial
+        # Both responses are compared before any state is updated, so a response which fails to validate leaves the
+        # watcher as it was and the next poll compares with the same state
+        cart_changes, cart_hash, cart_entries = self._diff_cart(cart_body, emit)
+        round_changes, registrations_hash, round_statuses, round_dates = (
+            self._diff_registrations(registrations_body, emit)
+        )
+        self._cart_hash = cart_hash
+        self._cart_entries = cart_entries
+        self._registrations_hash = registrations_hash
+        self._round_statuses = round_statuses
+        self._round_dates = round_dates
+        self._polled = True
+        return [*cart_changes, *round_changes]
+
+    def _diff_cart(
+        self, body: bytes, emit: bool
+    ) -> tuple[list[CartChange], bytes, dict[tuple, bytes]]:
+        """
+        Compare the courses cart with the previous one, without updating the watcher.
+
+        :param body: The raw response of ``services/registrations/courses_cart``.
+        :param emit: Whether to report changes, or only compute the new state.
+        :return: The changed entries, the hash of the response and the hashes of its entries.
+        """
+        body_hash = content_hash(body)
+        if body_hash == self._cart_hash:
+            return [], body_hash, self._cart_entries
+
+        changes = []
+        entries = {}
+        for index, entry in enumerate(json_backend.loads(body)):
+            key = (
+                (entry.get("course") or {}).get("id"),
+                (entry.get("term") or {}).get("id"),
+            )
+            if key == (None, None):
+                key = (index, None)  # Neither field was requested
+            entry_hash = content_hash(json_backend.dumps(entry))
+            entries[key] = entry_hash
+            previous_hash = self._cart_entries.get(key)
+            if not emit or previous_hash == entry_hash:
+                continue
+            model = self.registration_service.connection.resolve_entities(
+                _cart_entry_adapter.validate_python(entry)
+            )
+            changes.append(
+                CartChange("added" if previous_hash is None else "changed", key, model)
+            )
+        if emit:
+            for key in self._cart_entries.keys() - entries.keys():
+                changes.append(CartChange("removed", key, None))
+        return changes, body_hash, entries
+
+    def _diff_registrations(
+        self, body: bytes, emit: bool
+    ) -> tuple[list[RoundChange], bytes, dict[str, str | None], list[datetime]]:
+        """
+        Compare the statuses of registration rounds with the previous ones, without updating the watcher.
+
+        :param body: The raw response of ``services/registrations/user_registrations``.
+        :param emit: Whether to report changes, or only compute the new state.
+        :return: The rounds whose status changed, the hash of the response, the statuses of rounds and their dates.
+        """
+        body_hash = content_hash(body)
+        if body_hash == self._registrations_hash:
+            return [], body_hash, self._round_statuses, self._round_dates
+
+        changes = []
+        statuses = {}
+        round_dates = []
+        registrations = self.registration_service.connection.resolve_entities(
+            _registrations_adapter.validate_json(body)
+        )
+        for registration in registrations:
+            for round_ in registration.rounds or []:
+                statuses[round_.id] = round_.status
+                round_dates.extend(
+                    date for date in (round_.start_date, round_.end_date) if date
+                )
+                previous_status = self._round_statuses.get(round_.id)
+                if emit and (
+                    round_.id not in self._round_statuses
+                    or previous_status != round_.status
+                ):
+                    changes.append(RoundChange(registration, round_, previous_status))
+        return changes, body_hash, statuses, round_dates
+
+    def get_interval(self) -> float:
+        """
+        Get the time until the next poll, shorter near the start and the end of registration rounds.
+
+        :return: The time, in seconds.
+        """
+        now = (
+            self.clock.now()
+            if self.clock is not None and self.clock.reference is not None
+            else datetime.now()
+        )
+        interval = self.max_interval
+        for date in self._round_dates:
+            remaining = (date - now).total_seconds()
+            interval = min(interval, abs(remaining) * _APPROACH_FACTOR)
+            if remaining > 0:
+                interval = min(interval, remaining)
+        return max(interval, self.min_interval)
@@ -0,0 +1,197 @@
+import asyncio
+import random
+import time
+from email.utils import parsedate_to_datetime
+from fnmatch import fnmatchcase
+
+import aiohttp
+
+from .exceptions import USOSAPIHTTPException
+
+# Services which change state on the server and must not be sent twice
+NON_IDEMPOTENT_SERVICES = (
+    "services/oauth/*",
+    "services/registrations/register",
+    "services/registrations/unregister",
+)
+
+RETRYABLE_ERRORS = (
+    USOSAPIHTTPException,
+    aiohttp.ClientConnectionError,
+    aiohttp.ClientPayloadError,
+    asyncio.TimeoutError,
+)
+
+
+def is_idempotent_service(
+    service: str, non_idempotent_services: tuple[str, ...] = NON_IDEMPOTENT_SERVICES
+) -> bool:
+    """
+    Check whether calling a service twice has the same effect as calling it once.
+
+    :param service: The service path.
+    :param non_idempotent_services: Patterns of services known to change state on the server.
+    :return: True if the service is safe to repeat.
+    """
+    return not any(fnmatchcase(service, pattern) for pattern in non_idempotent_services)
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse the value of a ``Retry-After`` header.
+
+    :param value: The header value, either a number of seconds or an HTTP date.
+    :return: Number of seconds to wait, or None if the value is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class RetryBudget:
+    """
+    A global limit of retries, shared by all requests using the same policy.
+
+    Every request deposits `ratio` of a retry into the budget and every retry withdraws a whole one,
+    so retries can add at most `ratio` extra load, plus a small `min_per_second` reserve for low traffic.
+    This keeps a failing server from being hit by a storm of retries.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, max_balance: float = 50.0
+    ):
+        """
+        Initialize the retry budget.
+
+        :param ratio: Fraction of a retry earned by each request.
+        :param min_per_second: Number of retries always allowed per second, regardless of traffic.
+        :param max_balance: Maximum number of retries that can be saved up.
+        """
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_balance = max_balance
+        self._balance = max_balance
+        self._updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._balance = min(
+            self.max_balance,
+            self._balance + (now - self._updated_at) * self.min_per_second,
+        )
+        self._updated_at = now
+
+    @property
+    def balance(self) -> float:
+        """
+        Number of retries currently available.
+        """
+        self._refill()
+        return self._balance
+
+    def deposit(self) -> None:
+        """
+        Record a request.
+        """
+        self._refill()
+        self._balance = min(self.max_balance, self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget.
+
+        :return: True if a retry is allowed.
+        """
+        self._refill()
+        if self._balance < 1:
+            return False
+        self._balance -= 1
+        return True
+
+
+class RetryPolicy:
+    """
+    A policy for retrying failed idempotent requests with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        max_total_delay: float = 30.0,
+        retry_statuses: frozenset[int] = frozenset({429, 502, 503, 504}),
+        retry_connection_errors: bool = True,
+        respect_retry_after: bool = True,
+        non_idempotent_services: tuple[str, ...] = NON_IDEMPOTENT_SERVICES,
+        budget: RetryBudget | None = None,
+    ):
+        """
+        Initialize the retry policy.
+
+        :param max_retries: Maximum number of retries of a single call.
+        :param backoff_base: Delay (in seconds) before the first retry, doubled with every next one. Each delay is randomised between zero and its value (full jitter).
+        :param backoff_max: Maximum delay (in seconds) between two attempts.
+        :param max_total_delay: Maximum time (in seconds) a single call may spend waiting for retries.
+        :param retry_statuses: HTTP statuses worth retrying.
+        :param retry_connection_errors: Whether to retry connection errors and timeouts.
+        :param respect_retry_after: Whether to wait as long as the ``Retry-After`` header asks. If it asks for longer than `backoff_max`, the call is not retried.
+        :param non_idempotent_services: Patterns of services which are never retried, e.g. course registration.
+        :param budget: The global retry budget. If not given, a new one is created for this policy.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_total_delay = max_total_delay
+        self.retry_statuses = retry_statuses
+        self.retry_connection_errors = retry_connection_errors
+        self.respect_retry_after = respect_retry_after
+        self.non_idempotent_services = non_idempotent_services
+        self.budget = budget or RetryBudget()
+
+    def is_retryable_service(self, service: str) -> bool:
+        """
+        Check whether calls to the service may be retried.
+
+        :param service: The service path.
+        :return: True if the service may be retried.
+        """
+        return is_idempotent_service(service, self.non_idempotent_services)
+
+    def get_retry_delay(
+        self, attempt: int, error: Exception, waited: float
+    ) -> float | None:
+        """
+        Decide whether a failed call should be retried.
+
+        :param attempt: Number of retries already made for the call.
+        :param error: The error of the last attempt.
+        :param waited: Time (in seconds) the call has already spent waiting for retries.
+        :return: The delay (in seconds) before the next attempt, or None if the call should not be retried.
+        """
+        if attempt >= self.max_retries:
+            return None
+        if isinstance(error, USOSAPIHTTPException):
+            if error.status not in self.retry_statuses:
+                return None
+        elif not self.retry_connection_errors:
+            return None
+
+        delay = random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+        retry_after = getattr(error, "retry_after", None)
+        if self.respect_retry_after and retry_after is not None:
+            if retry_after > self.backoff_max:
+                return None
+            delay = max(delay, retry_after)
+        if waited + delay > self.max_total_delay:
+            return None
+        if not self.budget.withdraw():
+            return None
+        return delay
@@ -0,0 +1,337 @@
+import asyncio
+import heapq
+import random
+from collections import deque
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from .context import UserContext
+from .logger import get_logger
+
+_LOGGER = get_logger("Scheduler")
+
+
+@dataclass
+class SchedulerStats:
+    """
+    Snapshot of the scheduler usage.
+
+    :ivar int jobs: Number of registered jobs.
+    :ivar int running: Number of jobs currently running.
+    :ivar int runs: Number of finished runs.
+    :ivar int failures: Number of runs which raised an exception.
+    :ivar int missed_deadlines: Number of runs which did not start before the next run was due, and were skipped.
+    :ivar float total_lateness: Total time (in seconds) runs started after they were due.
+    :ivar float max_lateness: The longest time (in seconds) a single run started after it was due.
+    """
+
+    jobs: int = 0
+    running: int = 0
+    runs: int = 0
+    failures: int = 0
+    missed_deadlines: int = 0
+    total_lateness: float = 0.0
+    max_lateness: float = 0.0
+
+    @property
+    def average_lateness(self) -> float:
+        """
+        Average time (in seconds) a run started after it was due.
+        """
+        if not self.runs:
+            return 0.0
+        return self.total_lateness / self.runs
+
+
+@dataclass(eq=False)
+class _Job:
+    """
+    A registered job with its runtime state.
+    """
+
+    name: str
+    function: Callable[[], Awaitable[Any]]
+    interval: float
+    jitter: float
+    user_context: UserContext | None
+    stats: SchedulerStats = field(default_factory=lambda: SchedulerStats(jobs=1))
+    removed: bool = False
+
+    @property
+    def token(self) -> str | None:
+        """
+        The access token the job runs with, None for the client's own token.
+        """
+        return self.user_context.access_token if self.user_context else None
+
+
+class Scheduler:
+    """
+    Runs registered jobs (e.g. refreshing grades, courses cart or registrations of many users) in the background, each on its own interval.
+
+    Runs are spread with random jitter, so jobs registered at once do not all hit the API at the same moment.
+    At most ``max_concurrency`` jobs run at once. When more jobs are due, access tokens take turns, so a user with
+    many jobs does not delay the others. A job never runs concurrently with itself: if a run started so late that
+    the next one was due already, the next one is skipped and counted as a missed deadline.
+    Exceptions raised by jobs are logged and counted, and the job keeps its schedule.
+    """
+
+    def __init__(self, max_concurrency: int = 10, jitter: float = 0.1):
+        """
+        Initialize the scheduler.
+
+        :param max_concurrency: The maximum number of jobs running at once, shared by all jobs.
+        :param jitter: The default jitter of jobs, as a fraction of their interval.
+        """
+        self.max_concurrency = max_concurrency
+        self.jitter = jitter
+        self._jobs: dict[str, _Job] = {}
+        self._schedule: list[tuple[float, int, _Job]] = []
+        self._sequence = 0
+        self._ready: dict[str | None, deque[tuple[float, _Job]]] = {}
+        self._turns: deque[str | None] = deque()
+        self._running: set[asyncio.Task] = set()
+        self._semaphore: asyncio.Semaphore | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._dispatcher: asyncio.Task | None = None
+        self._stats = SchedulerStats()
+
+    async def __aenter__(self) -> "Scheduler":
+        """
+        Start the scheduler.
+
+        :return: The scheduler.
+        """
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """
+        Stop the scheduler, waiting for running jobs.
+
+        :param exc_type: The exception type.
+        :param exc_value: The exception value.
+        :param traceback: The traceback.
+        """
+        await self.stop()
+
+    def add_job(
+        self,
+        name: str,
+        function: Callable[[], Awaitable[Any]],
+        interval: float,
+        user_context: UserContext | None = None,
+        jitter: float | None = None,
+    ) -> None:
+        """
+        Register a job. Its first run is due after a random part of its jitter, so jobs added together are spread out.
+
+        :param name: The unique name of the job.
+        :param function: The coroutine function to run, without arguments, e.g. ``lambda: client.grade_service.get_grades_by_terms(term_ids)``.
+        :param interval: The time (in seconds) between the starts of runs.
+        :param user_context: The user to run the job on behalf of. If not given, the job runs with the client's own token.
+        :param jitter: The jitter of the job, as a fraction of its interval. If not given, the scheduler's default is used.
+        :raises ValueError: If the name is already used or the interval is not positive.
+        """
+        if name in self._jobs:
+            raise ValueError(f"Job {name!r} is already registered.")
+        if interval <= 0:
+            raise ValueError("Interval must be positive.")
+        job = _Job(
+            name,
+            function,
+            interval,
+            self.jitter if jitter is None else jitter,
+            user_context,
+        )
+        self._jobs[name] = job
+        now = asyncio.get_running_loop().time() if self._dispatcher else 0.0
+        self._push(job, now + random.uniform(0, job.jitter * job.interval))
+
+    def remove_job(self, name: str) -> None:
+        """
+        Unregister a job. A run in progress is not interrupted.
+
+        :param name: The name of the job.
+        :raises KeyError: If there is no such job.
+        """
+        self._jobs.pop(name).removed = True
+
+    def get_stats(self, name: str | None = None) -> SchedulerStats:
+        """
+        Get statistics of the scheduler or of a single job.
+
+        :param name: The name of the job. If not given, statistics of all jobs, including removed ones, are returned.
+        :return: The statistics.
+        """
+        if name is not None:
+            stats = self._jobs[name].stats
+            return SchedulerStats(**vars(stats))
+        return SchedulerStats(
+            len(self._jobs),
+            len(self._running),
+            self._stats.runs,
+            self._stats.failures,
+            self._stats.missed_deadlines,
+            self._stats.total_lateness,
+            self._stats.max_lateness,
+        )
+
+    async def start(self) -> None:
+        """
+        Start running jobs in the background.
+        """
+        if self._dispatcher is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._wakeup = asyncio.Event()
+        # Jobs added before the start are due relative to it
+        now = loop.time()
+        self._schedule = [
+            (now + due, sequence, job) for due, sequence, job in self._schedule
+        ]
+        heapq.heapify(self._schedule)
+        self._dispatcher = asyncio.ensure_future(self._dispatch())
+
+    async def stop(self, timeout: float | None = None) -> None:
+        """
+        Stop starting new runs and wait for the running ones.
+
+        :param timeout: The maximum time (in seconds) to wait for running jobs, they are cancelled after it. If not given, wait until they finish.
+        """
+        if self._dispatcher is None:
+            return
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+        if self._running:
+            _, pending = await asyncio.wait(set(self._running), timeout=timeout)
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.wait(pending)
+                _LOGGER.warning(f"Cancelled {len(pending)} jobs on shutdown")
+        # Keep the schedule, so the scheduler can be started again
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        self._schedule = [
+            (max(due - now, 0.0), sequence, job)
+            for due, sequence, job in self._schedule
+        ]
+        for jobs in self._ready.values():
+            for due, job in jobs:
+                self._push(job, 0.0)
+        self._ready.clear()
+        self._turns.clear()
+
+    def _push(self, job: _Job, due: float) -> None:
+        """
+        Schedule a run of a job.
+
+        :param job: The job.
+        :param due: When the run is due, in the event loop's time.
+        """
+        self._sequence += 1
+        heapq.heappush(self._schedule, (due, self._sequence, job))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _next_ready(self) -> tuple[float, _Job] | None:
+        """
+        Take the next due run, letting access tokens take turns.
+
+        :return: The due time and the job, or None if no run is due.
+        """
+        while self._turns:
+            token = self._turns.popleft()
+            runs = self._ready[token]
+            due, job = runs.popleft()
+            if runs:
+                self._turns.append(token)
+            else:
+                del self._ready[token]
+            if not job.removed:
+                return due, job
+        return None
+
+    async def _dispatch(self) -> None:
+        """
+        Start due runs as long as there is capacity.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            now = loop.time()
+            while self._schedule and self._schedule[0][0] <= now:
+                due, _, job = heapq.heappop(self._schedule)
+                if job.removed:
+                    continue
+                if job.token not in self._ready:
+                    self._ready[job.token] = deque()
+                    self._turns.append(job.token)
+                self._ready[job.token].append((due, job))
+
+            if not self._turns:
+                self._wakeup.clear()
+                timeout = self._schedule[0][0] - now if self._schedule else None
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            await self._semaphore.acquire()
+            run = self._next_ready()
+            if run is None:
+                self._semaphore.release()
+                continue
+            task = asyncio.ensure_future(self._run(*run))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, due: float, job: _Job) -> None:
+        """
+        Run a job once and schedule its next run.
+
+        :param due: When the run was due, in the event loop's time.
+        :param job: The job.
+        """
+        loop = asyncio.get_running_loop()
+        lateness = max(loop.time() - due, 0.0)
+        job.stats.running = 1
+        try:
+            with job.user_context.use() if job.user_context else nullcontext():
+                await job.function()
+        except Exception as e:
+            for stats in (self._stats, job.stats):
+                stats.failures += 1
+            _LOGGER.error(f"Job {job.name!r} failed: {e!r}")
+        finally:
+            self._semaphore.release()
+            job.stats.running = 0
+            for stats in (self._stats, job.stats):
+                stats.runs += 1
+                stats.total_lateness += lateness
+                stats.max_lateness = max(stats.max_lateness, lateness)
+            if not job.removed:
+                self._schedule_next(job, due)
+
+    def _schedule_next(self, job: _Job, due: float) -> None:
+        """
+        Schedule the run of a job following the one that was due at the given time.
+
+        :param job: The job.
+        :param due: When the previous run was due, in the event loop's time.
+        """
+        next_due = due + job.interval * (1 + random.uniform(-job.jitter, job.jitter))
+        now = asyncio.get_running_loop().time()
+        while next_due <= now:
+            # Never catch up with a burst of runs, skip the missed ones
+            next_due += job.interval
+            for stats in (self._stats, job.stats):
+                stats.missed_deadlines += 1
+        self._push(job, next_due)
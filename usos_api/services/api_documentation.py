@@ -1,3 +1,7 @@
+import asyncio
+from dataclasses import dataclass
+from typing import AsyncIterator
+
 from usos_api.models.api_documentation import (
     APIMethodIndexItem,
     APIMethodInfo,
@@ -5,6 +9,33 @@ from usos_api.models.api_documentation import (
     ScopeInfo,
 )
 
+from .. import json_backend
+from ..cache import CacheBackend, CacheKey, MemoryCacheBackend
+from ..logger import get_logger
+from ..utils import content_hash
+
+_LOGGER = get_logger("APIDocumentationService")
+
+# Crawled modules are stored under this service name, apart from cached responses
+_CRAWL_SERVICE = "usos_api/apiref_crawl"
+
+
+@dataclass
+class ModuleDocumentation:
+    """
+    Documentation of an API module and all of its methods, as crawled by :meth:`APIDocumentationService.crawl`.
+
+    :ivar str name: The module path, e.g. ``services/users``.
+    :ivar APIModuleInfo info: The module information.
+    :ivar dict[str, APIMethodInfo] methods: Information about the module's methods, keyed by method path.
+    :ivar bool cached: Whether the module was taken from the store, because its method list did not change.
+    """
+
+    name: str
+    info: APIModuleInfo
+    methods: dict[str, APIMethodInfo]
+    cached: bool = False
+
 
 class APIDocumentationService:
     """
@@ -18,6 +49,19 @@ class APIDocumentationService:
         :param connection: The connection to use.
         """
         self.connection = connection
+        self._method_endpoint = connection.endpoint(
+            "services/apiref/method", response_type=APIMethodInfo
+        )
+        self._method_index_endpoint = connection.endpoint(
+            "services/apiref/method_index", response_type=list[APIMethodIndexItem]
+        )
+        self._module_endpoint = connection.endpoint(
+            "services/apiref/module", response_type=APIModuleInfo
+        )
+        self._scopes_endpoint = connection.endpoint(
+            "services/apiref/scopes", response_type=list[ScopeInfo]
+        )
+        self._crawl_store = MemoryCacheBackend()
 
     async def get_method_info(
         self, method: str, fields: list[str] | None = None
@@ -33,18 +77,14 @@ class APIDocumentationService:
         if not method.startswith("services/"):
             method = f"services/{method}"
 
-        response = await self.connection.post(
-            "services/apiref/method", name=method, fields=fields
-        )
-        return APIMethodInfo(**response)
+        return await self._method_endpoint.post(name=method, fields=fields)
 
     async def get_method_index(self) -> list[APIMethodIndexItem]:
         """
         Get a list of API methods with brief descriptions.
         :return: List of objects representing the methods.
         """
-        response = await self.connection.post("services/apiref/method_index")
-        return [APIMethodIndexItem(**item) for item in response]
+        return await self._method_index_endpoint.post()
 
     async def get_module_info(self, module_name: str) -> APIModuleInfo:
         """
@@ -55,15 +95,144 @@ class APIDocumentationService:
         """
         if not module_name.startswith("services/"):
             module_name = f"services/{module_name}"
-        response = await self.connection.post(
-            "services/apiref/module", name=module_name
-        )
-        return APIModuleInfo(**response)
+        return await self._module_endpoint.post(name=module_name)
 
     async def get_scopes(self) -> list[ScopeInfo]:
         """
         Get a list of all scopes available in the USOS API installation.
         :return: List of scope information objects.
         """
-        response = await self.connection.post("services/apiref/scopes")
-        return [ScopeInfo(**scope) for scope in response]
+        return await self._scopes_endpoint.post()
+
+    async def crawl(
+        self,
+        store: CacheBackend | None = None,
+        max_concurrency: int = 8,
+        refresh: bool = False,
+    ) -> AsyncIterator[ModuleDocumentation]:
+        """
+        Crawl the documentation of all modules and methods listed in the method index.
+
+        Modules are yielded as soon as the module and all of its methods are fetched. Module and method information
+        is fetched concurrently, with a bound on the number of requests in flight. Crawled modules are kept in the
+        store, and a module is fetched again only if its methods in the method index changed, the others are yielded
+        from the store first.
+
+        :param store: The storage of crawled modules. Modules of different installations are kept apart, so one store can be shared. If not given, the backend of the connection's response cache is used, or memory (per service) if the connection has no cache. Pass a :class:`SQLiteCacheBackend` (or use one for the response cache) to keep modules across restarts, otherwise only crawls within one process are incremental.
+        :param max_concurrency: The maximum number of requests in flight.
+        :param refresh: Whether to fetch all modules, ignoring the store.
+        :return: An async iterator of crawled modules.
+        """
+        if store is None:
+            cache = self.connection.cache
+            store = cache.backend if cache is not None else self._crawl_store
+        methods_by_module: dict[str, list[str]] = {}
+        for method in await self.get_method_index():
+            module = method.name.rsplit("/", 1)[0]
+            methods_by_module.setdefault(module, []).append(method.name)
+
+        cached = []
+        to_fetch = {}
+        for module, methods in methods_by_module.items():
+            index_hash = content_hash(json_backend.dumps(sorted(methods))).hex()
+            record = None if refresh else await store.get(self._crawl_key(module))
+            if record is not None:
+                record = json_backend.loads(record)
+                if record["index_hash"] == index_hash:
+                    cached.append(
+                        ModuleDocumentation(
+                            module,
+                            APIModuleInfo.model_validate(record["info"]),
+                            {
+                                name: APIMethodInfo.model_validate(info)
+                                for name, info in record["methods"].items()
+                            },
+                            cached=True,
+                        )
+                    )
+                    continue
+            to_fetch[module] = (methods, index_hash)
+        _LOGGER.debug(f"Crawling {len(to_fetch)} of {len(methods_by_module)} modules")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        tasks = [
+            asyncio.ensure_future(
+                self._crawl_module(module, methods, index_hash, store, semaphore)
+            )
+            for module, (methods, index_hash) in to_fetch.items()
+        ]
+        try:
+            # Stored modules are yielded while the changed ones are fetched
+            for documentation in cached:
+                yield documentation
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            # Also when the iteration is stopped early or a module fails
+            for task in tasks:
+                task.cancel()
+
+    async def _crawl_module(
+        self,
+        module: str,
+        methods: list[str],
+        index_hash: str,
+        store: CacheBackend,
+        semaphore: asyncio.Semaphore,
+    ) -> ModuleDocumentation:
+        """
+        Fetch a module and its methods concurrently, and keep them in the store.
+
+        :param module: The module path.
+        :param methods: The paths of the module's methods, from the method index.
+        :param index_hash: The hash of the method list, stored to detect changes.
+        :param store: The storage of crawled modules.
+        :param semaphore: The semaphore bounding the number of requests in flight.
+        :return: The crawled module.
+        """
+
+        async def limited(function, name):
+            async with semaphore:
+                return await function(name)
+
+        tasks = [
+            asyncio.ensure_future(limited(self.get_module_info, module)),
+            *(
+                asyncio.ensure_future(limited(self.get_method_info, method))
+                for method in methods
+            ),
+        ]
+        try:
+            info, *method_infos = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        documentation = ModuleDocumentation(
+            module, info, dict(zip(methods, method_infos))
+        )
+        record = {
+            "index_hash": index_hash,
+            "info": info.model_dump(mode="json"),
+            "methods": {
+                name: method_info.model_dump(mode="json")
+                for name, method_info in documentation.methods.items()
+            },
+        }
+        await store.set(self._crawl_key(module), json_backend.dumps(record), None)
+        return documentation
+
+    def _crawl_key(self, module: str) -> CacheKey:
+        """
+        Build the key of a crawled module in the store.
+
+        :param module: The module path.
+        :return: The key.
+        """
+        return CacheKey(
+            self.connection.base_address,
+            self.connection.auth_manager.consumer_key,
+            _CRAWL_SERVICE,
+            f"name={module}",
+            None,
+        )
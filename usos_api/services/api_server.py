@@ -13,6 +13,9 @@ class APIServerService:
         :param connection: The connection to use.
         """
         self.connection = connection
+        self._consumer_endpoint = connection.endpoint(
+            "services/apisrv/consumer", response_type=Consumer
+        )
 
     async def get_consumer_info(self, fields: list[str] | None = None) -> Consumer:
         """
@@ -31,8 +34,4 @@ class APIServerService:
                 "token_scopes",
             ]
         fields = "|".join(fields)
-        response = await self.connection.post("services/apisrv/consumer", fields=fields)
-        return self._deserialize_consumer(response)
-
-    def _deserialize_consumer(self, data: dict) -> Consumer:
-        return Consumer(**data)
+        return await self._consumer_endpoint.post(fields=fields)
@@ -1,7 +1,10 @@
-from typing import Optional
+from typing import Optional, Sequence
 
+from .. import json_backend
 from ..connection import USOSAPIConnection
-from ..models import Course, CourseEdition, Term
+from ..loader import BatchLoader
+from ..models import Course, CourseEdition, LazyModel, Term
+from ..utils import gather_chunks
 
 
 class CourseService:
@@ -9,13 +12,28 @@ class CourseService:
     A service for course-related operations.
     """
 
-    def __init__(self, connection: USOSAPIConnection):
+    def __init__(
+        self,
+        connection: USOSAPIConnection,
+        max_ids_per_request: int = 50,
+        max_concurrent_requests: int = 4,
+    ):
         """
         Initialize the course service.
 
         :param connection: The connection to use.
+        :param max_ids_per_request: The maximum number of course IDs sent in a single request, longer lists are split.
+        :param max_concurrent_requests: The maximum number of split requests sent at once.
         """
         self.connection = connection
+        self.max_ids_per_request = max_ids_per_request
+        self.max_concurrent_requests = max_concurrent_requests
+        self._courses_endpoint = connection.endpoint(
+            "services/courses/courses",
+            fields="id|name",
+            response_type=dict[str, Course | None],
+        )
+        self._course_loaders: dict[str, BatchLoader[str, Course]] = {}
 
     async def get_user_courses_ects(self) -> dict[str, dict[str, Optional[float]]]:
         """
@@ -45,43 +63,163 @@ class CourseService:
         if not course_ids:
             return []
 
-        course_ids_str = "|".join(course_ids)
         fields_str = "|".join(fields) if fields else "id|name"
 
-        response = await self.connection.post(
-            "services/courses/courses", course_ids=course_ids_str, fields=fields_str
+        async def fetch_courses(chunk: Sequence[str]) -> dict[str, Course | None]:
+            return await self._courses_endpoint.post(
+                course_ids="|".join(chunk), fields=fields_str
+            )
+
+        responses = await gather_chunks(
+            fetch_courses,
+            course_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
         )
+        return [
+            course
+            for response in responses
+            for course in response.values()
+            if course is not None
+        ]
+
+    async def load_course(
+        self, course_id: str, fields: Optional[list[str]] = None
+    ) -> Optional[Course]:
+        """
+        Get a course by its ID, batched with other courses requested at the same time.
 
-        return [Course(**course_data) for course_data in response.values()]
+        Concurrent calls with the same fields (e.g. in ``asyncio.gather``) are sent as a single request to ``services/courses/courses``.
+
+        :param course_id: The ID of the course to get.
+        :param fields: The fields to include in the response.
+        :return: The course, or None if it does not exist.
+        """
+        fields_str = "|".join(fields) if fields else "id|name"
+        loader = self._course_loaders.get(fields_str)
+        if loader is None:
+
+            async def load_courses(course_ids: list[str]) -> dict[str, Course | None]:
+                return await self._courses_endpoint.post(
+                    course_ids="|".join(course_ids), fields=fields_str
+                )
+
+            loader = self._course_loaders[fields_str] = BatchLoader(
+                load_courses,
+                self.max_ids_per_request,
+                self.connection.auth_manager.get_token_identity,
+            )
+        return await loader.load(course_id)
 
     async def get_user_course_editions(
         self,
         active_terms_only: bool = False,
         ongoing_terms_only: bool = False,
-    ) -> list[CourseEdition]:
+        lazy: bool = False,
+    ) -> list[CourseEdition] | list[LazyModel[CourseEdition]]:
         """
         Get information on user's courses.
 
         This is a BETA method. We're looking for beta-testers. Until we find them, there's a substantial probability it won't stay backwards-compatible!
         If you are planning on using this method, please let us know. Then, we will work with you and move it out of beta as soon as we can.
 
+        If the connection's cache has a term policy, course editions of closed terms are served from the cache and only the active terms are fetched.
+
         :param active_terms_only: Return only these course editions which are related to the currently active academic terms. Apparently, this parameter does not always work as expected, so you can use `ongoing_terms_only` instead.
         :param ongoing_terms_only: Return only these course editions which are related to the currently ongoing academic terms (filtered locally based on start and finish dates).
+        :param lazy: Return lazy views of course editions, which validate fields (e.g. lecturers or user groups) only when they are read. Much cheaper if you only read a few fields.
         :return: A dictionary of selected fields and their values.
         """
-        params = {
-            "fields": "course_editions[course_id|course_name|term_id|homepage_url|profile_url|coordinators|lecturers|passing_status|user_groups|grades|attributes]|terms",
-            "active_terms_only": str(active_terms_only).lower(),
-        }
+        fields = "course_editions[course_id|course_name|term_id|homepage_url|profile_url|coordinators|lecturers|passing_status|user_groups|grades|attributes]|terms"
+
+        cache = self.connection.cache
+        if active_terms_only or cache is None or cache.term_policy is None:
+            response = await self.connection.post(
+                "services/courses/user",
+                fields=fields,
+                active_terms_only=str(active_terms_only).lower(),
+            )
+        else:
+            response = await self._fetch_user_course_editions_cached(fields)
+
+        terms = self.connection.resolve_entities(
+            {term["id"]: Term(**term) for term in response["terms"]}
+        )
+        ongoing_terms = {term_id for term_id, term in terms.items() if term.is_ongoing}
 
-        response = await self.connection.post("services/courses/user", **params)
+        if lazy:
+            return [
+                LazyModel(CourseEdition, course_edition)
+                for term_id, course_editions in response["course_editions"].items()
+                if not ongoing_terms_only or term_id in ongoing_terms
+                for course_edition in course_editions
+            ]
+        return self.connection.resolve_entities(
+            [
+                CourseEdition(**course_edition)
+                for term_id, course_editions in response["course_editions"].items()
+                if not ongoing_terms_only or term_id in ongoing_terms
+                for course_edition in course_editions
+            ]
+        )
 
-        terms = {term["id"]: Term(**term) for term in response["terms"]}
-        ongoing_terms = {term_id for term_id, term in terms.items() if term.is_ongoing}
+    async def _fetch_user_course_editions_cached(self, fields: str) -> dict:
+        """
+        Fetch raw course editions of the user, serving closed terms from the cache.
 
-        return [
-            CourseEdition(**course_edition)
-            for term_id, course_editions in response["course_editions"].items()
-            if not ongoing_terms_only or term_id in ongoing_terms
-            for course_edition in course_editions
-        ]
+        Closed terms are stored as a snapshot. While the snapshot is valid, only active terms are fetched and merged into it.
+        The snapshot is valid if every term which was not closed when it was taken is still returned among the active terms.
+
+        :param fields: The fields to include in the response.
+        :return: The raw response with ``course_editions`` and ``terms``.
+        """
+        service = "services/courses/user"
+        cache = self.connection.cache
+        policy = cache.term_policy
+        key = cache.make_key(
+            self.connection.base_address,
+            self.connection.auth_manager.consumer_key,
+            service,
+            {"fields": fields, "closed_terms": "true"},
+            self.connection.auth_manager.get_token_identity(),
+        )
+
+        cached = await cache.get(key)
+        if cached is not None:
+            snapshot = json_backend.loads(cached)
+            fresh = await self.connection.post(
+                service, fields=fields, active_terms_only="true"
+            )
+            fresh_term_ids = {term["id"] for term in fresh["terms"]}
+            if fresh_term_ids.issuperset(snapshot["open_term_ids"]):
+                terms = {term["id"]: term for term in snapshot["terms"]}
+                terms.update((term["id"], term) for term in fresh["terms"])
+                return {
+                    "course_editions": {
+                        **snapshot["course_editions"],
+                        **fresh["course_editions"],
+                    },
+                    "terms": list(terms.values()),
+                }
+
+        response = await self.connection.post(
+            service, fields=fields, active_terms_only="false"
+        )
+        terms = [Term(**term) for term in response["terms"]]
+        closed_term_ids = {term.id for term in terms if policy.is_closed(term)}
+        open_terms = [term for term in terms if term.id not in closed_term_ids]
+        # Partial refreshes fetch only active terms, so every open term has to be active
+        if closed_term_ids and all(term.is_active for term in open_terms):
+            snapshot = {
+                "course_editions": {
+                    term_id: course_editions
+                    for term_id, course_editions in response["course_editions"].items()
+                    if term_id in closed_term_ids
+                },
+                "terms": [
+                    term for term in response["terms"] if term["id"] in closed_term_ids
+                ],
+                "open_term_ids": [term.id for term in open_terms],
+            }
+            await cache.set(key, json_backend.dumps(snapshot), policy.closed_ttl)
+        return response
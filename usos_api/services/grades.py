@@ -1,5 +1,26 @@
+import asyncio
+from typing import Sequence
+
+from pydantic import BaseModel, Field
+
 from ..connection import USOSAPIConnection
-from ..models import Grade
+from ..models import Grade, Term
+from ..utils import gather_chunks
+from .terms import TermService
+
+
+class _CourseGrades(BaseModel):
+    """
+    Grades of a single course, as returned by ``services/grades/terms2``.
+    """
+
+    course_units_grades: dict[str, list[dict[str, Grade | None]]] = Field(
+        default_factory=dict
+    )
+    course_grades: list[dict[str, Grade | None]] = Field(default_factory=list)
+
+
+_TermsGrades = dict[str, dict[str, _CourseGrades]]
 
 
 class GradeService:
@@ -7,13 +28,30 @@ class GradeService:
     A service for grade-related operations.
     """
 
-    def __init__(self, connection: USOSAPIConnection):
+    def __init__(
+        self,
+        connection: USOSAPIConnection,
+        max_ids_per_request: int = 10,
+        max_concurrent_requests: int = 4,
+        term_service: TermService | None = None,
+    ):
         """
         Initialize the grade service.
 
         :param connection: The connection to use.
+        :param max_ids_per_request: The maximum number of term IDs sent in a single request, longer lists are split.
+        :param max_concurrent_requests: The maximum number of split requests sent at once.
+        :param term_service: The service to get terms with, for the term cache policy. If not given, a new one is created.
         """
         self.connection = connection
+        self.max_ids_per_request = max_ids_per_request
+        self.max_concurrent_requests = max_concurrent_requests
+        self.term_service = term_service or TermService(connection)
+        # Terms seen by the term cache policy, their dates do not change
+        self._terms: dict[str, Term] = {}
+        self._terms_grades_endpoint = connection.endpoint(
+            "services/grades/terms2", response_type=_TermsGrades
+        )
 
     async def get_grades_by_terms(
         self, term_ids: list[str] | str, fields: list[str] = None
@@ -21,6 +59,8 @@ class GradeService:
         """
         Get grades by terms.
 
+        If the connection's cache has a term policy, grades of closed terms are served from the cache and only the other terms are fetched.
+
         :param term_ids: The IDs of the terms to get grades for, or a single term ID.
         :param fields: The fields to include in the response.
         :return: The grades.
@@ -35,11 +75,7 @@ class GradeService:
             "counts_into_average",
         ]
 
-        response = await self.connection.post(
-            "services/grades/terms2",
-            term_ids="|".join(term_ids),
-            fields="|".join(fields),
-        )
+        response = await self._fetch_grades(term_ids, "|".join(fields))
 
         new_response = {}
         term_id: str
@@ -48,8 +84,117 @@ class GradeService:
 
         return new_response
 
+    async def _fetch_grades(self, term_ids: list[str], fields: str) -> _TermsGrades:
+        """
+        Fetch grades of terms, using the term-aware cache if it is enabled.
+
+        :param term_ids: The IDs of the terms to get grades for.
+        :param fields: The fields to include in the response.
+        :return: The grades of courses, keyed by term ID.
+        """
+        cache = self.connection.cache
+        if cache is None or cache.term_policy is None:
+            return await self._post_grades(term_ids, fields)
+
+        endpoint = self._terms_grades_endpoint
+        token = self.connection.auth_manager.get_token_identity()
+        keys = {
+            term_id: cache.make_key(
+                self.connection.base_address,
+                self.connection.auth_manager.consumer_key,
+                endpoint.service,
+                {"term_ids": term_id, "fields": fields},
+                token,
+            )
+            for term_id in term_ids
+        }
+        response = {}
+        missing = []
+        cached_values = await asyncio.gather(*(cache.get(key) for key in keys.values()))
+        for term_id, cached in zip(keys, cached_values):
+            if cached is not None:
+                response.update(endpoint.decode(cached))
+            else:
+                missing.append(term_id)
+
+        if missing:
+            unknown = [term_id for term_id in missing if term_id not in self._terms]
+            if unknown:
+                fresh, terms = await asyncio.gather(
+                    self._post_grades(missing, fields),
+                    self.term_service.get_terms(unknown),
+                )
+                self._terms.update((term.id, term) for term in terms)
+            else:
+                fresh = await self._post_grades(missing, fields)
+            await asyncio.gather(
+                *(
+                    cache.set_term_data(
+                        keys[term_id],
+                        endpoint.adapter.dump_json({term_id: courses}),
+                        self._terms.get(term_id),
+                    )
+                    for term_id, courses in fresh.items()
+                    if term_id in keys
+                )
+            )
+            response.update(fresh)
+
+        return {
+            term_id: response[term_id] for term_id in term_ids if term_id in response
+        }
+
+    async def _post_grades(self, term_ids: list[str], fields: str) -> _TermsGrades:
+        """
+        Fetch grades of terms, splitting long lists of terms into concurrent requests.
+
+        :param term_ids: The IDs of the terms to get grades for.
+        :param fields: The fields to include in the response.
+        :return: The grades of courses, keyed by term ID.
+        """
+
+        async def fetch_grades(chunk: Sequence[str]) -> _TermsGrades:
+            return await self._terms_grades_endpoint.post(
+                term_ids="|".join(chunk), fields=fields
+            )
+
+        responses = await gather_chunks(
+            fetch_grades,
+            term_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
+        )
+        return {
+            term_id: courses
+            for response in responses
+            for term_id, courses in response.items()
+        }
+
+    async def get_raw_grades_by_terms(
+        self, term_ids: list[str], fields: str
+    ) -> list[tuple[Sequence[str], bytes]]:
+        """
+        Fetch raw, undecoded grades of terms, splitting long lists of terms into concurrent requests.
+
+        :param term_ids: The IDs of the terms to get grades for.
+        :param fields: The fields to include in the response.
+        :return: The IDs of the terms in every request with its raw response body, in order.
+        """
+
+        async def fetch_grades(chunk: Sequence[str]) -> tuple[Sequence[str], bytes]:
+            return chunk, await self._terms_grades_endpoint.post_raw(
+                term_ids="|".join(chunk), fields=fields
+            )
+
+        return await gather_chunks(
+            fetch_grades,
+            term_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
+        )
+
     def _process_courses(
-        self, courses: dict
+        self, courses: dict[str, _CourseGrades]
     ) -> dict[str, dict[str, dict[str, Grade] | list[Grade]]]:
         """
         Process courses to extract grades.
@@ -60,9 +205,9 @@ class GradeService:
         processed_courses = {}
         for course_id, grades in courses.items():
             course_units_grades = self._process_course_units_grades(
-                grades["course_units_grades"]
+                grades.course_units_grades
             )
-            course_grades = self._process_course_grades(grades["course_grades"])
+            course_grades = self._process_course_grades(grades.course_grades)
             processed_courses[course_id] = {
                 "course_units_grades": course_units_grades,
                 "course_grades": course_grades,
@@ -70,7 +215,7 @@ class GradeService:
         return processed_courses
 
     def _process_course_units_grades(
-        self, course_units_grades: dict
+        self, course_units_grades: dict[str, list[dict[str, Grade | None]]]
     ) -> dict[str, dict[str, Grade]]:
         """
         Process course units grades.
@@ -81,14 +226,16 @@ class GradeService:
         processed_units_grades = {}
         for unit_id, units in course_units_grades.items():
             processed_units_grades[unit_id] = {
-                exam_session_number: Grade(**grade)
+                exam_session_number: grade
                 for unit in units
                 for exam_session_number, grade in unit.items()
                 if grade
             }
         return processed_units_grades
 
-    def _process_course_grades(self, course_grades: list) -> list[Grade]:
+    def _process_course_grades(
+        self, course_grades: list[dict[str, Grade | None]]
+    ) -> list[Grade]:
         """
         Process course grades.
 
@@ -96,8 +243,5 @@ class GradeService:
         :return: The processed course grades.
         """
         return [
-            Grade(**grade)
-            for session in course_grades
-            for grade in session.values()
-            if grade
+            grade for session in course_grades for grade in session.values() if grade
         ]
@@ -1,6 +1,12 @@
+from typing import Sequence
+
+from pydantic import BaseModel, Field
+
 from ..connection import USOSAPIConnection
+from ..loader import BatchLoader
 from ..logger import get_logger
 from ..models import Group, Term
+from ..utils import gather_chunks
 
 
 def _filter_ongoing_terms(terms: list[Term]) -> list[Term]:
@@ -13,8 +19,25 @@ def _filter_ongoing_terms(terms: list[Term]) -> list[Term]:
     return [term for term in terms if term.is_ongoing]
 
 
-def _deserialize_term(data: dict) -> Term:
-    return Term(**data)
+def _encode_group_ids(group_ids: Sequence[tuple[str, str]]) -> str:
+    """
+    Encode group IDs in the format expected by the USOS API.
+
+    :param group_ids: The IDs of the groups, each a tuple of course unit ID and group number.
+    :return: Pipe-separated list of ``course_unit_id,group_number`` pairs.
+    """
+    return "|".join(
+        f"{course_unit_id},{group_number}" for course_unit_id, group_number in group_ids
+    )
+
+
+class _TermGroups(BaseModel):
+    """
+    Groups keyed by term ID with the terms, as returned by ``services/groups/user`` and similar services.
+    """
+
+    groups: dict[str, list[Group]] = Field(default_factory=dict)
+    terms: list[Term] = Field(default_factory=list)
 
 
 def _deserialize_group(data: dict, **kwargs) -> Group:
@@ -27,13 +50,35 @@ class GroupService:
     A service for group-related operations.
     """
 
-    def __init__(self, connection: USOSAPIConnection):
+    def __init__(
+        self,
+        connection: USOSAPIConnection,
+        max_ids_per_request: int = 50,
+        max_concurrent_requests: int = 4,
+    ):
         """
         Initialize the group
 
         :param connection: The connection to use.
+        :param max_ids_per_request: The maximum number of group IDs sent in a single request, longer lists are split.
+        :param max_concurrent_requests: The maximum number of split requests sent at once.
         """
         self.connection = connection
+        self.max_ids_per_request = max_ids_per_request
+        self.max_concurrent_requests = max_concurrent_requests
+        self._groups_endpoint = connection.endpoint(
+            "services/groups/groups", response_type=dict[str, Group | None]
+        )
+        self._lecturer_endpoint = connection.endpoint(
+            "services/groups/lecturer", response_type=_TermGroups
+        )
+        self._participant_endpoint = connection.endpoint(
+            "services/groups/participant", response_type=_TermGroups
+        )
+        self._user_endpoint = connection.endpoint(
+            "services/groups/user", response_type=_TermGroups
+        )
+        self._group_loaders: dict[str, BatchLoader[tuple[str, str], Group]] = {}
         self.logger = get_logger("GroupService")
 
     async def get_groups_by_ids(
@@ -55,10 +100,26 @@ class GroupService:
         if "group_number" not in fields:
             fields.append("group_number")
         fields = "|".join(fields)
-        response = await self.connection.post(
-            "services/groups/groups", group_ids=group_ids, fields=fields
+
+        async def fetch_groups(
+            chunk: Sequence[tuple[str, str]],
+        ) -> dict[str, Group | None]:
+            return await self._groups_endpoint.post(
+                group_ids=_encode_group_ids(chunk), fields=fields
+            )
+
+        responses = await gather_chunks(
+            fetch_groups,
+            group_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
         )
-        return [_deserialize_group(group) for group in response.values()]
+        return [
+            group
+            for response in responses
+            for group in response.values()
+            if group is not None
+        ]
 
     async def get_group_by_id(
         self, group_id: str, course_unit_id: str, fields: list[str] = None
@@ -86,8 +147,48 @@ class GroupService:
             course_unit_id=course_unit_id,
             fields=fields,
         )
-        print(response)
-        return [_deserialize_group(group) for group in response.values()]
+        return self.connection.resolve_entities(
+            [_deserialize_group(group) for group in response.values()]
+        )
+
+    async def load_group(
+        self, course_unit_id: str, group_number: int, fields: list[str] = None
+    ) -> Group | None:
+        """
+        Get a group by its ID, batched with other groups requested at the same time.
+
+        Concurrent calls with the same fields (e.g. in ``asyncio.gather``) are sent as a single request to ``services/groups/groups``.
+
+        :param course_unit_id: The ID of the course unit.
+        :param group_number: The number of the group.
+        :param fields: The fields to include in the response.
+        :return: The group, or None if it does not exist.
+        """
+        if not fields:
+            fields = ["course_unit_id", "group_number", "course_name"]
+        fields = list(dict.fromkeys([*fields, "course_unit_id", "group_number"]))
+        fields = "|".join(fields)
+        loader = self._group_loaders.get(fields)
+        if loader is None:
+
+            async def load_groups(
+                group_ids: list[tuple[str, str]],
+            ) -> dict[tuple[str, str], Group]:
+                response = await self._groups_endpoint.post(
+                    group_ids=_encode_group_ids(group_ids), fields=fields
+                )
+                return {
+                    (str(group.course_unit_id), str(group.group_number)): group
+                    for group in response.values()
+                    if group is not None
+                }
+
+            loader = self._group_loaders[fields] = BatchLoader(
+                load_groups,
+                self.max_ids_per_request,
+                self.connection.auth_manager.get_token_identity,
+            )
+        return await loader.load((str(course_unit_id), str(group_number)))
 
     async def get_groups_for_lecturer(
         self,
@@ -116,20 +217,19 @@ class GroupService:
                 "Both active_terms_only and ongoing_terms_only are set to True. It is recommended to use only one of them."
             )
         fields = "|".join(fields)
-        response = await self.connection.post(
-            "services/groups/lecturer",
+        response = await self._lecturer_endpoint.post(
             user_id=user_id,
             active_terms=active_terms_only,
             fields=fields,
             lang=lang,
         )
-        terms = [_deserialize_term(term) for term in response["terms"]]
+        terms = response.terms
         if ongoing_terms_only:
             terms = _filter_ongoing_terms(terms)
         term_ids = set(term.id for term in terms)
         return [
-            _deserialize_group(group)
-            for term_id, groups in response["groups"].items()
+            group
+            for term_id, groups in response.groups.items()
             if term_id in term_ids
             for group in groups
         ]
@@ -161,23 +261,23 @@ class GroupService:
                 "Both active_terms_only and ongoing_terms_only are set to True. It is recommended to use only one of them."
             )
         fields = "|".join(fields)
-        response = await self.connection.post(
-            "services/groups/participant",
+        response = await self._participant_endpoint.post(
             user_id=user_id,
             active_terms=active_terms_only,
             fields=fields,
             lang=lang,
         )
-        terms = [_deserialize_term(term) for term in response["terms"]]
+        terms = response.terms
         if ongoing_terms_only:
             terms = _filter_ongoing_terms(terms)
         term_ids = set(term.id for term in terms)
-        return [
-            _deserialize_group(group, term_id=term_id)
-            for term_id, groups in response["groups"].items()
-            if term_id in term_ids
-            for group in groups
-        ]
+        groups = []
+        for term_id, term_groups in response.groups.items():
+            if term_id in term_ids:
+                for group in term_groups:
+                    group.term_id = term_id
+                groups.extend(term_groups)
+        return groups
 
     async def get_groups_for_user(
         self,
@@ -208,20 +308,20 @@ class GroupService:
                 "Both active_terms_only and ongoing_terms_only are set to True. It is recommended to use only one of them."
             )
         fields = "|".join(fields)
-        response = await self.connection.post(
-            "services/groups/user",
+        response = await self._user_endpoint.post(
             user_id=user_id,
             active_terms=active_terms_only,
             fields=fields,
             lang=lang,
         )
-        terms = [_deserialize_term(term) for term in response["terms"]]
+        terms = response.terms
         if ongoing_terms_only:
             terms = _filter_ongoing_terms(terms)
         term_ids = set(term.id for term in terms)
-        return [
-            _deserialize_group(group, term_id=term_id)
-            for term_id, groups in response["groups"].items()
-            if term_id in term_ids
-            for group in groups
-        ]
+        groups = []
+        for term_id, term_groups in response.groups.items():
+            if term_id in term_ids:
+                for group in term_groups:
+                    group.term_id = term_id
+                groups.extend(term_groups)
+        return groups
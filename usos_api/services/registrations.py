@@ -1,5 +1,6 @@
 from ..connection import USOSAPIConnection
 from ..models import CoursesCart, Registration
+from ..prepared_registration import PreparedRegistration
 
 
 class RegistrationService:
@@ -14,6 +15,16 @@ class RegistrationService:
         :param connection: The connection to use.
         """
         self.connection = connection
+        self._user_registrations_endpoint = connection.endpoint(
+            "services/registrations/user_registrations",
+            response_type=list[Registration],
+        )
+        self._registration_endpoint = connection.endpoint(
+            "services/registrations/registration", response_type=Registration
+        )
+        self._courses_cart_endpoint = connection.endpoint(
+            "services/registrations/courses_cart", response_type=list[CoursesCart]
+        )
 
     async def get_user_registrations(
         self, active_only: bool = True, fields: list[str] = None
@@ -27,12 +38,9 @@ class RegistrationService:
         """
         fields = "|".join(fields) if fields else None
 
-        response = await self.connection.post(
-            "services/registrations/user_registrations",
-            fields=fields,
-            active_only=active_only,
+        return await self._user_registrations_endpoint.post(
+            fields=fields, active_only=active_only
         )
-        return [Registration(**registration) for registration in response]
 
     async def get_registration(
         self, registration_id: str, fields: list[str] = None
@@ -47,10 +55,7 @@ class RegistrationService:
 
         fields = "|".join(fields) if fields else None
 
-        response = await self.connection.post(
-            "services/registrations/registration", id=registration_id, fields=fields
-        )
-        return Registration(**response)
+        return await self._registration_endpoint.post(id=registration_id, fields=fields)
 
     async def register_to_course(
         self,
@@ -70,6 +75,65 @@ class RegistrationService:
         :param user_stage_id: User stage ID (optional).
         :return: Empty dict on success.
         """
+        data = self._get_registration_params(
+            round_id, course_id, term_id, user_programme_id, user_stage_id
+        )
+
+        response = await self.connection.post("services/registrations/register", **data)
+        return response
+
+    def prepare_registration(
+        self,
+        round_id: str,
+        course_id: str,
+        term_id: str,
+        user_programme_id: str = None,
+        user_stage_id: str = None,
+        connections: int = 2,
+        keepalive_interval: float = 2.0,
+    ) -> PreparedRegistration:
+        """
+        Prepare a registration to a course, to be sent the moment a registration round opens.
+
+        Call :meth:`PreparedRegistration.register_at` with the round's ``start_date``, on behalf of the same user.
+
+        :param round_id: Registration round ID.
+        :param course_id: Course code.
+        :param term_id: Cycle code.
+        :param user_programme_id: User program ID (optional).
+        :param user_stage_id: User stage ID (optional).
+        :param connections: The number of connections to the installation kept warm until the round opens.
+        :param keepalive_interval: How often (in seconds) warm connections are used, so the server does not close them.
+        :return: The prepared registration.
+        """
+        endpoint = self.connection.endpoint(
+            "services/registrations/register",
+            **self._get_registration_params(
+                round_id, course_id, term_id, user_programme_id, user_stage_id
+            ),
+        )
+        return PreparedRegistration(
+            self.connection, endpoint, connections, keepalive_interval
+        )
+
+    @staticmethod
+    def _get_registration_params(
+        round_id: str,
+        course_id: str,
+        term_id: str,
+        user_programme_id: str | None,
+        user_stage_id: str | None,
+    ) -> dict[str, str]:
+        """
+        Get the parameters of ``services/registrations/register``.
+
+        :param round_id: Registration round ID.
+        :param course_id: Course code.
+        :param term_id: Cycle code.
+        :param user_programme_id: User program ID (optional).
+        :param user_stage_id: User stage ID (optional).
+        :return: The parameters.
+        """
         data = {
             "round_id": round_id,
             "course_id": course_id,
@@ -79,9 +143,7 @@ class RegistrationService:
             data["user_programme_id"] = user_programme_id
         if user_stage_id:
             data["user_stage_id"] = user_stage_id
-
-        response = await self.connection.post("services/registrations/register", **data)
-        return response
+        return data
 
     async def get_courses_cart(self, fields: list[str] = None) -> list[CoursesCart]:
         """
@@ -106,7 +168,27 @@ class RegistrationService:
             ]
         fields = "|".join(fields)
 
-        response = await self.connection.post(
-            "services/registrations/courses_cart", fields=fields
+        return await self._courses_cart_endpoint.post(fields=fields)
+
+    async def get_raw_courses_cart(self, fields: list[str]) -> bytes:
+        """
+        Get the raw, undecoded courses cart, e.g. to detect changes without building models.
+
+        :param fields: Selector of result fields you are interested in.
+        :return: The raw response body.
+        """
+        return await self._courses_cart_endpoint.post_raw(fields="|".join(fields))
+
+    async def get_raw_user_registrations(
+        self, fields: list[str], active_only: bool = True
+    ) -> bytes:
+        """
+        Get raw, undecoded user registrations, e.g. to detect changes without building models.
+
+        :param fields: Selector of result fields you are interested in.
+        :param active_only: Whether to return only active registrations.
+        :return: The raw response body.
+        """
+        return await self._user_registrations_endpoint.post_raw(
+            fields="|".join(fields), active_only=active_only
         )
-        return [CoursesCart(**course) for course in response]
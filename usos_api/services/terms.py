@@ -1,5 +1,9 @@
+from typing import Sequence
+
 from ..connection import USOSAPIConnection
+from ..loader import BatchLoader
 from ..models import Term
+from ..utils import gather_chunks
 
 
 class TermService:
@@ -7,13 +11,33 @@ class TermService:
     A service for term-related operations.
     """
 
-    def __init__(self, connection: USOSAPIConnection):
+    def __init__(
+        self,
+        connection: USOSAPIConnection,
+        max_ids_per_request: int = 50,
+        max_concurrent_requests: int = 4,
+    ):
         """
         Initialize the term service.
 
         :param connection: The connection to use.
+        :param max_ids_per_request: The maximum number of term IDs sent in a single request, longer lists are split.
+        :param max_concurrent_requests: The maximum number of split requests sent at once.
         """
         self.connection = connection
+        self.max_ids_per_request = max_ids_per_request
+        self.max_concurrent_requests = max_concurrent_requests
+        self._term_endpoint = connection.endpoint(
+            "services/terms/term", response_type=Term
+        )
+        self._terms_endpoint = connection.endpoint(
+            "services/terms/terms", response_type=dict[str, Term | None]
+        )
+        self._term_loader = BatchLoader(
+            self._fetch_terms,
+            max_ids_per_request,
+            connection.auth_manager.get_token_identity,
+        )
 
     async def get_term(self, term_id: str) -> Term:
         """
@@ -22,8 +46,18 @@ class TermService:
         :param term_id: The ID of the term to get.
         :return: The term.
         """
-        response = await self.connection.post("services/terms/term", term_id=term_id)
-        return Term(**response)
+        return await self._term_endpoint.post(term_id=term_id)
+
+    async def load_term(self, term_id: str) -> Term | None:
+        """
+        Get a term by its ID, batched with other terms requested at the same time.
+
+        Concurrent calls (e.g. in ``asyncio.gather``) are sent as a single request to ``services/terms/terms``.
+
+        :param term_id: The ID of the term to get.
+        :return: The term, or None if it does not exist.
+        """
+        return await self._term_loader.load(term_id)
 
     async def get_terms(self, term_ids: list[str]) -> list[Term]:
         """
@@ -32,8 +66,27 @@ class TermService:
         :param term_ids: The IDs of the terms to get, or a single term ID.
         :return: The terms.
         """
+        if isinstance(term_ids, str):
+            term_ids = [term_ids]
 
-        term_ids = "|".join(term_ids)
+        responses = await gather_chunks(
+            self._fetch_terms,
+            term_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
+        )
+        return [
+            term
+            for response in responses
+            for term in response.values()
+            if term is not None
+        ]
 
-        response = await self.connection.post("services/terms/terms", term_ids=term_ids)
-        return [Term(**term) for term in response.values()]
+    async def _fetch_terms(self, term_ids: Sequence[str]) -> dict[str, Term | None]:
+        """
+        Fetch terms in a single request.
+
+        :param term_ids: The IDs of the terms to get.
+        :return: The terms keyed by ID, None for terms that do not exist.
+        """
+        return await self._terms_endpoint.post(term_ids="|".join(term_ids))
@@ -1,5 +1,10 @@
+from typing import Sequence
+
 from ..connection import USOSAPIConnection
 from ..models.user import User
+from ..utils import gather_chunks
+
+ROSTER_FIELDS = ["id", "first_name", "last_name"]
 
 
 class UserService:
@@ -7,13 +12,28 @@ class UserService:
     A service for user-related operations.
     """
 
-    def __init__(self, connection: USOSAPIConnection):
+    def __init__(
+        self,
+        connection: USOSAPIConnection,
+        max_ids_per_request: int = 100,
+        max_concurrent_requests: int = 4,
+    ):
         """
         Initialize the user service.
 
         :param connection: The connection to use.
+        :param max_ids_per_request: The maximum number of user IDs sent in a single request, longer lists are split.
+        :param max_concurrent_requests: The maximum number of split requests sent at once.
         """
         self.connection = connection
+        self.max_ids_per_request = max_ids_per_request
+        self.max_concurrent_requests = max_concurrent_requests
+        self._user_endpoint = connection.endpoint(
+            "services/users/user", response_type=User
+        )
+        self._users_endpoint = connection.endpoint(
+            "services/users/users", response_type=dict[str, User | None]
+        )
 
     async def get_user(
         self, user_id: int | None = None, fields: list[str] | None = None
@@ -41,10 +61,40 @@ class UserService:
                 "photo_urls[original]",
             ]  # Default fields
         fields = "|".join(fields)
-        response = await self.connection.post(
-            "services/users/user", user_id=user_id, fields=fields
-        )
-        return self._deserialize_user(response)
+        return await self._user_endpoint.post(user_id=user_id, fields=fields)
+
+    async def get_users(
+        self, user_ids: list[int], fields: list[str] | None = None
+    ) -> list[User]:
+        """
+        Get many users by their IDs, e.g. to show a group roster.
 
-    def _deserialize_user(self, data: dict) -> User:
-        return User(**data)
+        Long lists of IDs are split into chunks fetched concurrently from ``services/users/users``.
+
+        :param user_ids: The IDs of the users to get.
+        :param fields: The fields to include in the response. If not given, only the ID and the name are fetched (see :data:`ROSTER_FIELDS`).
+        :return: The users which exist, in the order of the IDs.
+        """
+        if not user_ids:
+            return []
+
+        fields = "|".join(fields or ROSTER_FIELDS)
+
+        async def fetch_users(chunk: Sequence[int]) -> dict[str, User | None]:
+            return await self._users_endpoint.post(
+                user_ids="|".join(map(str, chunk)), fields=fields
+            )
+
+        responses = await gather_chunks(
+            fetch_users,
+            user_ids,
+            self.max_ids_per_request,
+            self.max_concurrent_requests,
+        )
+        users = {
+            user_id: user
+            for response in responses
+            for user_id, user in response.items()
+            if user is not None
+        }
+        return [users[str(user_id)] for user_id in user_ids if str(user_id) in users]
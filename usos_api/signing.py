@@ -0,0 +1,142 @@
+import binascii
+import hashlib
+import hmac
+import time
+from functools import lru_cache
+from random import getrandbits
+from typing import Iterable
+from urllib.parse import quote
+
+from oauthlib.oauth1.rfc5849.signature import base_string_uri
+
+
+def escape(value: str) -> str:
+    """
+    Percent-encode a string as required by OAuth 1.0 (RFC 5849, section 3.6).
+
+    :param value: The string to encode.
+    :return: The encoded string.
+    """
+    return quote(value, safe="~")
+
+
+@lru_cache(maxsize=1024)
+def _escaped_base_string_uri(url: str) -> str:
+    """
+    Get the encoded base string URI of a URL, as used in the signature base string.
+
+    :param url: The URL without a query string.
+    :return: The encoded base string URI.
+    """
+    return escape(base_string_uri(url))
+
+
+class HMACSHA1Signer:
+    """
+    A fast OAuth 1.0 HMAC-SHA1 signer for a single consumer and token pair.
+
+    The signing key is precomputed once, and the encoded base URLs are cached, so signing a request only
+    encodes its parameters and computes the HMAC. Signatures are identical to the ones made by ``oauthlib``.
+    """
+
+    __slots__ = ("_consumer_key", "_token", "_hmac", "_header_tail")
+
+    def __init__(
+        self,
+        consumer_key: str,
+        consumer_secret: str,
+        token: str | None = None,
+        token_secret: str | None = None,
+    ):
+        """
+        Initialize the signer.
+
+        :param consumer_key: Consumer key obtained from the USOS API.
+        :param consumer_secret: Consumer secret obtained from the USOS API.
+        :param token: The access token, None to sign with the consumer only.
+        :param token_secret: The access token secret.
+        """
+        self._consumer_key = escape(consumer_key)
+        self._token = escape(token) if token else None
+        key = f"{escape(consumer_secret)}&{escape(token_secret or '')}"
+        self._hmac = hmac.new(key.encode("utf-8"), digestmod=hashlib.sha1)
+        self._header_tail = (
+            f'oauth_version="1.0", oauth_signature_method="HMAC-SHA1", '
+            f'oauth_consumer_key="{self._consumer_key}", '
+        )
+        if self._token:
+            self._header_tail += f'oauth_token="{self._token}", '
+
+    def sign(
+        self,
+        http_method: str,
+        url: str,
+        params: Iterable[tuple[str, str]] = (),
+        nonce: str | None = None,
+        timestamp: str | None = None,
+    ) -> str:
+        """
+        Sign a request.
+
+        :param http_method: The HTTP method of the request.
+        :param url: The URL of the request, without a query string.
+        :param params: The request parameters, sent either in the query string or in a form-encoded body.
+        :param nonce: The nonce to use, generated if not given.
+        :param timestamp: The timestamp to use, the current time if not given.
+        :return: The value of the ``Authorization`` header.
+        """
+        return self.sign_escaped(
+            http_method,
+            url,
+            [(escape(key), escape(value)) for key, value in params],
+            nonce,
+            timestamp,
+        )
+
+    def sign_escaped(
+        self,
+        http_method: str,
+        url: str,
+        escaped_params: list[tuple[str, str]],
+        nonce: str | None = None,
+        timestamp: str | None = None,
+    ) -> str:
+        """
+        Sign a request whose parameters are already percent-encoded with :func:`escape`.
+
+        The same encoded pairs can be joined into the query string or the form body, so they are encoded only once.
+
+        :param http_method: The HTTP method of the request.
+        :param url: The URL of the request, without a query string.
+        :param escaped_params: The encoded request parameters.
+        :param nonce: The nonce to use, generated if not given.
+        :param timestamp: The timestamp to use, the current time if not given.
+        :return: The value of the ``Authorization`` header.
+        """
+        if timestamp is None:
+            timestamp = str(int(time.time()))
+        if nonce is None:
+            nonce = str(getrandbits(64)) + timestamp
+
+        pairs = escaped_params.copy()
+        pairs.append(("oauth_consumer_key", self._consumer_key))
+        pairs.append(("oauth_nonce", escape(nonce)))
+        pairs.append(("oauth_signature_method", "HMAC-SHA1"))
+        pairs.append(("oauth_timestamp", escape(timestamp)))
+        if self._token:
+            pairs.append(("oauth_token", self._token))
+        pairs.append(("oauth_version", "1.0"))
+        pairs.sort()
+
+        normalized_params = "&".join([f"{key}={value}" for key, value in pairs])
+        base_string = (
+            f"{http_method.upper()}&{_escaped_base_string_uri(url)}"
+            f"&{escape(normalized_params)}"
+        )
+        mac = self._hmac.copy()
+        mac.update(base_string.encode("utf-8"))
+        signature = binascii.b2a_base64(mac.digest())[:-1].decode("utf-8")
+        return (
+            f'OAuth oauth_nonce="{escape(nonce)}", oauth_timestamp="{escape(timestamp)}", '
+            f'{self._header_tail}oauth_signature="{escape(signature)}"'
+        )
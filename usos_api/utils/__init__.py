@@ -0,0 +1,147 @@
+import asyncio
+import hashlib
+from fnmatch import fnmatchcase
+from typing import Any, Awaitable, Callable, Sequence, TypeVar
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+def match_service_rule(rules: dict[str, _T], service: str) -> tuple[str, _T] | None:
+    """
+    Find the first rule whose pattern matches the service path.
+
+    Patterns use shell-style wildcards, e.g. ``services/grades/*``.
+
+    :param rules: The rules keyed by service path patterns, checked in insertion order.
+    :param service: The service path, e.g. ``services/grades/terms2``.
+    :return: The matching pattern and its rule, or None if no rule matches.
+    """
+    for pattern, rule in rules.items():
+        if fnmatchcase(service, pattern):
+            return pattern, rule
+    return None
+
+
+def content_hash(data: bytes) -> bytes:
+    """
+    Get a hash of data, to detect changed responses without decoding them.
+
+    :param data: The data.
+    :return: The hash.
+    """
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def chunked(items: Sequence[_T], size: int) -> list[Sequence[_T]]:
+    """
+    Split items into chunks of at most `size` items.
+
+    :param items: The items to split.
+    :param size: The maximum size of a chunk.
+    :return: The chunks, in order.
+    """
+    if size < 1:
+        raise ValueError("Chunk size must be positive.")
+    return [items[i : i + size] for i in range(0, len(items), size)]
+
+
+async def gather_chunks(
+    fetch: Callable[[Sequence[_T]], Awaitable[_R]],
+    items: Sequence[_T],
+    chunk_size: int,
+    max_concurrency: int,
+) -> list[_R]:
+    """
+    Split items into chunks and fetch them concurrently, with a bound on the number of chunks fetched at once.
+
+    If fetching any chunk fails, the other chunks are cancelled and the error is raised.
+
+    :param fetch: The coroutine function fetching a single chunk.
+    :param items: The items to fetch.
+    :param chunk_size: The maximum size of a chunk.
+    :param max_concurrency: The maximum number of chunks fetched at once.
+    :return: The results of the chunks, in order.
+    """
+    chunks = chunked(items, chunk_size)
+    if len(chunks) == 1:
+        return [await fetch(chunks[0])]
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def fetch_chunk(chunk: Sequence[_T]) -> _R:
+        async with semaphore:
+            return await fetch(chunk)
+
+    tasks = [asyncio.ensure_future(fetch_chunk(chunk)) for chunk in chunks]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+
+
+class TaskGraph:
+    """
+    Runs coroutines which depend on each other's results, each as soon as its dependencies are done.
+
+    Independent calls run concurrently. If any call fails, the other calls are cancelled and the error is raised.
+    A call can only depend on calls added before it, so the graph never has cycles.
+    """
+
+    def __init__(self):
+        """
+        Initialize an empty graph.
+        """
+        self._calls: dict[
+            str, tuple[Callable[..., Awaitable[Any]], tuple[str, ...]]
+        ] = {}
+
+    def add(
+        self,
+        name: str,
+        function: Callable[..., Awaitable[Any]],
+        *dependencies: str,
+    ) -> None:
+        """
+        Add a call to the graph.
+
+        :param name: The name of the call, used to pass its result to other calls and to return it.
+        :param function: The coroutine function to call, with the results of the dependencies as positional arguments.
+        :param dependencies: The names of the calls whose results are needed, in the order they are passed.
+        :raises ValueError: If the name is already used or a dependency was not added yet.
+        """
+        if name in self._calls:
+            raise ValueError(f"Call {name!r} is already in the graph.")
+        for dependency in dependencies:
+            if dependency not in self._calls:
+                raise ValueError(
+                    f"Dependency {dependency!r} of {name!r} is not in the graph."
+                )
+        self._calls[name] = (function, dependencies)
+
+    async def run(self) -> dict[str, Any]:
+        """
+        Run all calls in the graph.
+
+        :return: The results of the calls, keyed by their names.
+        """
+        tasks: dict[str, asyncio.Future] = {}
+
+        async def call(
+            function: Callable[..., Awaitable[Any]], dependencies: tuple[str, ...]
+        ) -> Any:
+            return await function(
+                *[await tasks[dependency] for dependency in dependencies]
+            )
+
+        for name, (function, dependencies) in self._calls.items():
+            tasks[name] = asyncio.ensure_future(call(function, dependencies))
+        try:
+            results = await asyncio.gather(*tasks.values())
+        except BaseException:
+            for task in tasks.values():
+                task.cancel()
+            raise
+        return dict(zip(tasks, results))